@@ -1,15 +1,77 @@
-from typing import List
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+import mmap
+import multiprocessing
+import warnings
+from typing import Deque, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+# masses below this bound get their total fuel from a table shared by all launches
+FUEL_TABLE_SIZE = 1 << 20
 
 
 class RocketLaunch:
     """Aids the launch of Santa's rocket by providing fuel requirements.
 
     Args:
-        modules (List[int]): List containing the masses of all modules to be launched.
+        modules (Union[List[int], np.ndarray], optional): Masses of all modules
+            to be launched. A NumPy array of masses is processed in batch.
+            Defaults to no modules.
+        totals (Tuple[int, int], optional): Precomputed fuel requirements of the
+            modules, ignoring and considering fuel mass. If given, `modules` is
+            unused. Defaults to None.
     """
 
-    def __init__(self, modules: List[int] = []) -> None:
-        self.modules = modules
+    # total fuel of each mass below `FUEL_TABLE_SIZE`, built on first use
+    _fuel_table: Optional[np.ndarray] = None
+
+    def __init__(
+        self,
+        modules: Optional[Union[List[int], np.ndarray]] = None,
+        totals: Optional[Tuple[int, int]] = None,
+    ) -> None:
+        self.modules = modules if modules is not None else []
+        self.totals = totals
+
+    @classmethod
+    def from_file(
+        cls, path: str, chunk_size: int = 1 << 20, workers: int = 1
+    ) -> "RocketLaunch":
+        """Computes the fuel requirements of the modules listed in a file.
+
+        The file is memory-mapped and parsed in chunks of about `chunk_size`
+        bytes, ending on line breaks. Each chunk is reduced to its fuel
+        requirements in both modes at once, so memory use doesn't grow with
+        the file's size. Masses aren't kept.
+
+        Args:
+            path (str): Path of the file, with one mass per line.
+            chunk_size (int, optional): Size of the chunks, in bytes.
+                Defaults to 1 MiB.
+            workers (int, optional): Number of processes parsing chunks. If 1,
+                chunks are parsed in the current process. Defaults to 1.
+
+        Returns:
+            RocketLaunch: Launch holding the computed fuel requirements.
+        """
+        module_fuel = total_fuel = 0
+        with open(path, "rb") as f:
+            if not f.seek(0, 2):
+                return cls(totals=(0, 0))
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                chunks = _chunks(buffer, chunk_size)
+                if workers <= 1:
+                    sums = (_chunk_fuel(buffer[start:end]) for start, end in chunks)
+                else:
+                    sums = _map_chunks(path, chunks, workers)
+
+                for module, total in sums:
+                    module_fuel += module
+                    total_fuel += total
+
+        return cls(totals=(module_fuel, total_fuel))
 
     def fuel_requirements(self, ignore_fuel_mass: bool = False) -> int:
         """Calculates the total fuel required, given a list of module masses.
@@ -21,9 +83,73 @@ class RocketLaunch:
         Returns:
             int: Total fuel requirements.
         """
+        if self.totals is not None:
+            return self.totals[0] if ignore_fuel_mass else self.totals[1]
+        if isinstance(self.modules, np.ndarray):
+            return int(self.fuel_array(self.modules, ignore_fuel_mass).sum())
+
         fuel_req = self._get_module_fuel if ignore_fuel_mass else self._get_fuel
         return sum(fuel_req(mass) for mass in self.modules)
 
+    @classmethod
+    def fuel_array(
+        cls, masses: np.ndarray, ignore_fuel_mass: bool = False
+    ) -> np.ndarray:
+        """Calculates the fuel required by each module of an array, in batch.
+
+        Results are the same as `_get_module_fuel` and `_get_fuel`. Total fuel
+        of masses below `FUEL_TABLE_SIZE` is looked up in a shared table. Larger
+        masses are deduplicated, and the fuel step is applied to all of them at
+        once until they all fall in the table.
+
+        Args:
+            masses (np.ndarray): Masses of the modules, as 64-bit integers.
+            ignore_fuel_mass (bool): If true, the fuel's mass does not incur
+                the necessity of additional fuel.
+
+        Returns:
+            np.ndarray: Required fuel of each module.
+        """
+        masses = np.asarray(masses, dtype=np.int64)
+        if ignore_fuel_mass:
+            return masses // 3 - 2
+
+        table = cls._get_fuel_table()
+        fuel = np.zeros_like(masses)
+        in_table = (masses >= 0) & (masses < FUEL_TABLE_SIZE)
+        fuel[in_table] = table[masses[in_table]]
+
+        large = ~in_table
+        if large.any():
+            unique, inverse = np.unique(masses[large], return_inverse=True)
+            totals = np.zeros_like(unique)
+            step = unique // 3 - 2
+            while (step >= FUEL_TABLE_SIZE).any():
+                totals += np.maximum(step, 0)
+                step = step // 3 - 2
+            step = np.maximum(step, 0)
+            totals += step + table[step]
+            fuel[large] = totals[inverse]
+
+        return fuel
+
+    @classmethod
+    def _get_fuel_table(cls) -> np.ndarray:
+        """Gets the total fuel of every mass below `FUEL_TABLE_SIZE`."""
+        if cls._fuel_table is None:
+            table = np.zeros(FUEL_TABLE_SIZE, dtype=np.int64)
+            # masses up to 8 need no fuel, and the fuel of a mass is less than a
+            # third of it, so each range only depends on the previous ones
+            start = 9
+            while start < FUEL_TABLE_SIZE:
+                end = min(3 * start, FUEL_TABLE_SIZE)
+                fuel = np.arange(start, end) // 3 - 2
+                table[start:end] = fuel + table[fuel]
+                start = end
+            cls._fuel_table = table
+
+        return cls._fuel_table
+
     def _get_module_fuel(self, mass: int) -> int:
         """Calculates the required fuel to launch a module given its mass.
 
@@ -37,21 +163,79 @@ class RocketLaunch:
 
     def _get_fuel(self, mass: int) -> int:
         """Similar to `_get_module_fuel`, but takes fuel mass into consideration."""
+        total = 0
         fuel = mass // 3 - 2
 
-        if fuel > 0:
-            return fuel + self._get_fuel(fuel)
-        else:
-            return 0
+        while fuel > 0:
+            total += fuel
+            fuel = fuel // 3 - 2
+
+        return total
+
+
+def _chunks(buffer: mmap.mmap, chunk_size: int) -> Iterator[Tuple[int, int]]:
+    """Splits a buffer into chunks of about `chunk_size` bytes, ending on line breaks.
+
+    Yields:
+        Tuple[int, int]: Start and end offsets of each chunk.
+    """
+    size = len(buffer)
+    start = 0
+    while start < size:
+        end = buffer.find(b"\n", min(start + chunk_size, size) - 1)
+        end = size if end == -1 else end + 1
+        yield start, end
+        start = end
+
+
+def _map_chunks(
+    path: str, chunks: Iterator[Tuple[int, int]], workers: int
+) -> Iterator[Tuple[int, int]]:
+    """Computes the fuel requirements of chunks of a file on a pool of processes.
+
+    At most two chunks per worker are in flight, so memory use stays bounded.
+
+    Yields:
+        Tuple[int, int]: Fuel requirements of each chunk, in both modes.
+    """
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context()
+    ) as executor:
+        pending: Deque[Future] = deque()
+        for start, end in chunks:
+            pending.append(executor.submit(_read_chunk_fuel, path, start, end))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _chunk_fuel(chunk: bytes) -> Tuple[int, int]:
+    """Computes the fuel requirements of the masses in a chunk, in both modes."""
+    if not chunk.strip():
+        return 0, 0  # numpy parses blank text as a single 0
+
+    with warnings.catch_warnings():
+        # numpy only warns about data that isn't a number, and drops the rest
+        warnings.simplefilter("error", DeprecationWarning)
+        masses = np.fromstring(chunk, dtype=np.int64, sep=" ")
+    module_fuel = RocketLaunch.fuel_array(masses, ignore_fuel_mass=True)
+    total_fuel = RocketLaunch.fuel_array(masses)
+    return int(module_fuel.sum()), int(total_fuel.sum())
+
+
+def _read_chunk_fuel(path: str, start: int, end: int) -> Tuple[int, int]:
+    """Computes the fuel requirements of the masses in a chunk of a file."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        return _chunk_fuel(f.read(end - start))
 
 
 if __name__ == "__main__":
-    with open("data/day_01_modules.txt", "r") as f:
-        modules = [int(mass) for mass in f.read().split("\n") if mass != ""]
-        launch = RocketLaunch(modules)
+    launch = RocketLaunch.from_file("data/day_01_modules.txt")
 
-        print("Challenge 1:")
-        print(launch.fuel_requirements(ignore_fuel_mass=True))
+    print("Challenge 1:")
+    print(launch.fuel_requirements(ignore_fuel_mass=True))
 
-        print("\nChallenge 2:")
-        print(launch.fuel_requirements())
+    print("\nChallenge 2:")
+    print(launch.fuel_requirements())
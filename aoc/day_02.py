@@ -1,17 +1,114 @@
 from __future__ import annotations
-from typing import Union, Tuple
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import hashlib
+from itertools import product
+import multiprocessing
+import warnings
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    MutableSequence,
+    NamedTuple,
+    Optional,
+    Set,
+    Union,
+    Tuple,
+)
+
+from aoc.intcode_analysis import Analysis, analyze, disassemble
+from aoc.intcode_checkpoint import restore_checkpoint, save_checkpoint
+from aoc.intcode_compiler import CompiledEngine
+from aoc.intcode_memory import Image, PagedMemory, parse_image
+from aoc.intcode_opcodes import ARITY, opcode_of
+from aoc.intcode_profiler import IntcodeProfiler
+from aoc.intcode_symbolic import Polynomial, Symbolic, SymbolicError, SymbolicMemory
+
+InputSource = Union[Iterable[int], Callable[[], int]]
+OutputSink = Union[Callable[[int], Any], Any]
+
+
+class Instruction(NamedTuple):
+    """Decoded Intcode instruction.
+
+    Attributes:
+        opcode (int): The operation's code.
+        modes (Tuple[int, ...]): Mode flag of each parameter. 0 stands for
+            position mode and 1 for immediate mode.
+        n_params (int): Number of parameters used by the operation.
+        params (Tuple[int, ...]): Raw parameters following the opcode.
+    """
+
+    opcode: int
+    modes: Tuple[int, ...]
+    n_params: int
+    params: Tuple[int, ...]
 
 
 class IntcodeComputer:
     """Intcode computer that runs the provided program.
 
+    The program is parsed once into a compact image of 64-bit integers, which
+    is copied in bulk whenever the memory is reset. Instructions are decoded
+    once and cached by address. A cached instruction is dropped whenever the
+    program writes to any of its addresses, so self-modifying programs are
+    still supported. Instructions decoded from unmodified memory are kept
+    across resets.
+
     Args:
         program (str): The intcode program. Has the form of a string
             of comma-separated integers.
+        inputs (InputSource, optional): Source of the values read by the input
+            opcode. Can be any iterable (a deque is consumed from the left) or a
+            callable returning the next value. Defaults to reading from stdin.
+        outputs (OutputSink, optional): Sink for the values written by the output
+            opcode. Can be any object with an `append` method (e.g. list or deque)
+            or a callable receiving each value. Defaults to printing to stdout.
+        engine (str, optional): Either "interpreter" or "compiled". The compiled
+            engine translates basic blocks of the program into Python functions,
+            falling back to the interpreter for I/O and for modified code.
+            Defaults to "interpreter".
+        memory (str, optional): Either "dense" or "paged". Dense memory is a
+            copy of the program image, with no addresses past its end. Paged
+            memory is an unbounded `PagedMemory`: addresses past the image read
+            as 0 and are allocated a page at a time when written to. It can't be
+            used with the compiled engine. Defaults to "dense".
     """
 
-    def __init__(self, program: str = "") -> None:
+    engines = ("interpreter", "compiled")
+    memory_models = ("dense", "paged")
+
+    # number of parameters of each opcode
+    _arity = ARITY
+
+    def __init__(
+        self,
+        program: str = "",
+        inputs: Optional[InputSource] = None,
+        outputs: Optional[OutputSink] = None,
+        engine: str = "interpreter",
+        memory: str = "dense",
+    ) -> None:
+        if engine not in self.engines:
+            raise ValueError(f"Engine must be one of {self.engines}, not {engine!r}.")
+        if memory not in self.memory_models:
+            raise ValueError(
+                f"Memory must be one of {self.memory_models}, not {memory!r}."
+            )
+        if engine == "compiled" and memory == "paged":
+            raise ValueError("The compiled engine needs dense memory.")
+
         self.program = program
+        self.engine = engine
+        self.memory_model = memory
+        self._copy_on_write = False
+        self._inputs = inputs
+        self._outputs = outputs
+        self._reset_io()
 
         self._opcodes = {
             1: self._op_sum,
@@ -23,67 +120,560 @@ class IntcodeComputer:
             7: self._op_less_than,
             8: self._op_equals,
         }
+        self._max_params = max(self._arity.values())
         self._reset_memory()
 
     def execute(self) -> IntcodeComputer:
         """Runs the computer's program from its initial state."""
+        return self.reset()._run()
+
+    def profile(self) -> IntcodeProfiler:
+        """Runs the program from its initial state, recording execution statistics.
+
+        Returns:
+            IntcodeProfiler: The recorded statistics.
+        """
+        return IntcodeProfiler(self).execute()
+
+    def analyze(self) -> Analysis:
+        """Analyzes the program statically, enabling fast paths if it is static.
+
+        When every instruction is proven to run as found in the program image,
+        all of them are decoded up front, and the engines skip bounds checks
+        and self-modification guards. This lasts until the program or its
+        inputs are changed. See `intcode_analysis`.
+
+        Returns:
+            Analysis: The analysis.
+        """
+        analysis = analyze(self)
+        if analysis.static:
+            self._analysis = analysis
+            self._image_decoded = dict(analysis.instructions)
+            self._image_cells = set()
+            self._reset_memory()
+        return analysis
+
+    def disassemble(self) -> str:
+        """Turns the program into readable instructions. See `intcode_analysis`."""
+        return disassemble(self)
+
+    def save_checkpoint(self, path: str) -> IntcodeComputer:
+        """Saves the computer's state to a file. See `intcode_checkpoint`."""
+        save_checkpoint(self, path)
+        return self
+
+    def restore_checkpoint(self, path: str) -> IntcodeComputer:
+        """Restores the computer's state from a file. See `intcode_checkpoint`."""
+        return restore_checkpoint(path, self)
+
+    def reset(self) -> IntcodeComputer:
+        """Sets the computer back to its initial state, without running it.
+
+        Memory is reset, the instruction pointer goes back to address 0 and the
+        I/O channels are bound again, so iterables are read from the start.
+        """
         self._reset_memory()
+        self._reset_io()
 
-        pointer = 0
-        modes, opcode = self._parse_op(pointer)
+        return self
 
-        while opcode != 99:
-            try:
-                # run instruction and get pointer move size
-                move = self._opcodes[opcode](pointer, modes) + 1
-            except KeyError as err:
-                print(f"Opcode {opcode} not found! Instruction is invalid.")
-                raise err
+    def run(
+        self, max_steps: Optional[int] = None
+    ) -> Generator[Optional[int], Optional[int], None]:
+        """Runs the program from its current state, pausing on I/O.
 
-            pointer += move
+        The generator yields every value output by the program. When the program
+        needs input and the input source is empty, it yields None: the value can
+        then be sent into the generator, or added to the source before resuming.
+
+        The generator returns when the program halts, or after running
+        `max_steps` instructions. The computer keeps its state (`pointer`,
+        `memory` and `halted`), so calling `run` again resumes the program.
+
+        Args:
+            max_steps (int, optional): Maximum number of instructions to run.
+                Defaults to no limit.
+
+        Yields:
+            Optional[int]: Output values, or None when waiting for input.
+        """
+        advance = self._advance_compiled if self.engine == "compiled" else self._advance
+        steps = 0
+
+        while not self.halted:
+            budget = None if max_steps is None else max_steps - steps
+            self.pointer, n_steps = advance(self.pointer, budget)
+            steps += n_steps
+            if steps == max_steps:
+                return
+
+            pointer = self.pointer
+            instruction = self._decode(pointer)
+            if instruction.opcode == 99:
+                self.halted = True
+            elif instruction.opcode == 4:
+                self.pointer = pointer + 2
+                steps += 1
+                yield self._load(instruction, 0)
+            else:
+                try:
+                    value = self._read()
+                except (StopIteration, IndexError):
+                    value = yield None
+                    if value is None:
+                        continue
+
+                self._write(instruction.params[0], value)
+                if self._compiled_engine is not None:
+                    self._compiled_engine.invalidate(instruction.params[0])
+                self.pointer = pointer + 2
+                steps += 1
+
+    def fork(self) -> IntcodeComputer:
+        """Creates a computer that shares this computer's program image.
+
+        The new computer's memory is copy-on-write: resetting it is free, and
+        running it only copies the pages of the image that it writes to.
+        Input changes and I/O channels are copied over.
+
+        Returns:
+            IntcodeComputer: The new computer.
+        """
+        computer = IntcodeComputer(
+            inputs=self.inputs,
+            outputs=self.outputs,
+            engine=self.engine,
+            memory=self.memory_model,
+        )
+        computer._set_image(self._image)
+        computer._patches = dict(self._patches)
+        computer._image_decoded = dict(self._image_decoded)
+        computer._image_cells = set(self._image_cells)
+        computer._copy_on_write = True
+        computer._reset_memory()
+
+        return computer
+
+    @property
+    def inputs(self) -> Optional[InputSource]:
+        """Source of the values read by the input opcode."""
+        return self._inputs
+
+    @inputs.setter
+    def inputs(self, inputs: Optional[InputSource]) -> None:
+        self._inputs = inputs
+        self._bind_inputs()
+
+    @property
+    def outputs(self) -> Optional[OutputSink]:
+        """Sink for the values written by the output opcode."""
+        return self._outputs
+
+    @outputs.setter
+    def outputs(self, outputs: Optional[OutputSink]) -> None:
+        self._outputs = outputs
+        self._bind_outputs()
+
+    @property
+    def program(self) -> str:
+        """The intcode program, as a string of comma-separated integers."""
+        return ",".join(str(x) for x in self._patched_image())
+
+    @program.setter
+    def program(self, program: str) -> None:
+        self._set_image(parse_image(program))
+
+    def search_inputs(
+        self,
+        target: int,
+        noun_range: Iterable[int] = range(100),
+        verb_range: Iterable[int] = range(100),
+        workers: int = 1,
+    ) -> Optional[Tuple[int, int]]:
+        """Searches for the inputs that make the program output a given value.
+
+        The output is the integer left in address 0 once the program halts. The
+        (noun, verb) pairs are split by noun into chunks that are spread over a
+        pool of `workers` processes, each of which receives the parsed program
+        only once. All workers stop as soon as one of them finds a match.
+
+        Every try reads the values of the computer's input source from the
+        start. Only lists, tuples, ranges and deques of inputs can be sent to
+        the workers: with any other source, a program that reads input raises
+        an `EOFError`.
+
+        Args:
+            target (int): The expected output.
+            noun_range, verb_range (Iterable[int]): Values to try as inputs.
+            workers (int, optional): Number of processes. If 1, the search runs
+                in the current process. Defaults to 1.
+
+        Returns:
+            Optional[Tuple[int, int]]: A matching (noun, verb) pair, or None if
+                no pair produces the target. With several workers, any of the
+                matching pairs may be returned.
+        """
+        return _search_patches(
+            self._patched_image(),
+            target,
+            (1, 2),
+            (list(noun_range), list(verb_range)),
+            workers,
+            self._replayable_inputs(),
+        )
+
+    def evaluate_symbolic(self, unknowns: Iterable[int] = (1, 2)) -> Polynomial:
+        """Runs the program with unknown values in some of its addresses.
+
+        The unknown in the i-th given address is named `x<i>`. Sums and products
+        are tracked as polynomials on the unknowns, while any use of an unknown
+        in control flow, addressing or output raises a `SymbolicError`. Either way,
+        the computer is reset afterwards.
+
+        Args:
+            unknowns (Iterable[int], optional): Addresses holding unknown values.
+                Defaults to the noun and verb addresses, (1, 2).
+
+        Returns:
+            Polynomial: The value left in address 0 once the program halts.
+        """
+        memory = SymbolicMemory(self._patched_image())
+        for index, address in enumerate(unknowns):
+            memory[address] = Polynomial.variable(index)
+
+        self._load_memory(memory)
+        self._reset_io()
+        emit = self._emit
+        self._emit = lambda value: emit(
+            value._concrete("output") if isinstance(value, Symbolic) else value
+        )
+        try:
+            # compiled blocks can only hold concrete values
+            self._interpret()
+        finally:
+            # leave the computer in its initial, concrete state
+            self.reset()
+
+        result = memory[0]
+        if isinstance(result, Polynomial):
+            return result
+        if isinstance(result, int):
+            return Polynomial.constant(result)
+        return result._concrete("the result")
+
+    def solve_inputs(
+        self,
+        target: int,
+        unknowns: Optional[Dict[int, Iterable[int]]] = None,
+        workers: int = 1,
+    ) -> Optional[Tuple[int, ...]]:
+        """Finds values for some addresses that make the program output a given value.
+
+        The output is the integer left in address 0 once the program halts. It is
+        first found as a polynomial on the unknown values through
+        `evaluate_symbolic`, and then solved for `target`. If that fails, a
+        warning is issued and a concrete search is run instead.
+
+        Args:
+            target (int): The expected output.
+            unknowns (Dict[int, Iterable[int]], optional): Possible values for each
+                unknown address. Defaults to values between 0 and 99 for the noun
+                and verb.
+            workers (int, optional): Number of processes used by the concrete
+                search. Defaults to 1.
 
-            try:
-                modes, opcode = self._parse_op(pointer)
-            except IndexError as err:
-                print("Program has no halt opcode (99) at its end!")
-                raise err
+        Returns:
+            Optional[Tuple[int, ...]]: Values of the unknowns, in the same order as
+                `unknowns`, or None if no combination produces the target.
+        """
+        if unknowns is None:
+            unknowns = {1: range(100), 2: range(100)}
+        addresses = tuple(unknowns)
+        ranges = tuple(list(values) for values in unknowns.values())
 
+        try:
+            result = self.evaluate_symbolic(addresses)
+        except SymbolicError as err:
+            warnings.warn(f"{err} Falling back to concrete search.", RuntimeWarning)
+            image = self._patched_image()
+            inputs = self._replayable_inputs()
+            return _search_patches(image, target, addresses, ranges, workers, inputs)
+
+        return next(result.solve(target, ranges), None)
+
+    def _run(self) -> IntcodeComputer:
+        """Runs the program from address 0 on the current memory, until it halts."""
+        if self.engine == "compiled":
+            self.pointer = self._compiled().run(self.pointer)
+            self.halted = True
+            return self
+        return self._interpret()
+
+    def _interpret(self) -> IntcodeComputer:
+        """Runs the program through the interpreter, until it halts."""
+        pointer = self.pointer
+        instruction = self._fetch(pointer)
+
+        while instruction.opcode != 99:
+            # run instruction and get pointer move size
+            move = self._opcodes[instruction.opcode](pointer, instruction) + 1
+            pointer += move
+            instruction = self._fetch(pointer)
+
+        self.pointer = pointer
+        self.halted = True
         return self
 
+    def _advance(
+        self, pointer: int, max_steps: Optional[int] = None
+    ) -> Tuple[int, int]:
+        """Runs the program until it needs I/O or halts, or runs out of steps.
+
+        Args:
+            pointer (int): Address of the first instruction.
+            max_steps (int, optional): Maximum number of instructions to run.
+
+        Returns:
+            Tuple[int, int]: Address of the next instruction and number of
+                instructions run.
+        """
+        steps = 0
+        instruction = self._fetch(pointer)
+
+        while instruction.opcode not in (3, 4, 99) and steps != max_steps:
+            pointer += self._opcodes[instruction.opcode](pointer, instruction) + 1
+            steps += 1
+            instruction = self._fetch(pointer)
+
+        return pointer, steps
+
+    def _advance_compiled(
+        self, pointer: int, max_steps: Optional[int] = None
+    ) -> Tuple[int, int]:
+        """Same as `_advance`, but running compiled code."""
+        return self._compiled().advance(pointer, max_steps)
+
+    def _compiled(self) -> CompiledEngine:
+        """Gets the compiled engine bound to the current memory."""
+        if self._compiled_engine is None:
+            self._compiled_engine = CompiledEngine(self)
+        return self._compiled_engine
+
     def change_inputs(
         self, noun: Union[int, str], verb: Union[int, str]
     ) -> IntcodeComputer:
         """Changes the program's inputs permanently.
 
         The inputs are the integers located in addresses 1 and 2 (noun and verb,
-        respectively).
+        respectively). They are kept apart from the program image, and written to
+        memory whenever it is reset.
 
         Args:
             noun, verb (int): New inputs that will update the program.
         """
-        program = [x for x in self.program.split(",")]
-        program[1:3] = [str(noun), str(verb)]
-        self.program = ",".join(program)
+        self._patch(1, int(noun))
+        self._patch(2, int(verb))
 
         return self
 
     def _reset_memory(self) -> None:
         """Sets computer's memory back to its initial state."""
-        self.memory = [int(x) for x in self.program.split(",")]
+        if self._copy_on_write or self.memory_model == "paged":
+            memory = PagedMemory(self._image, unbounded=self.memory_model == "paged")
+            for address, value in self._patches.items():
+                memory[address] = value
+        else:
+            memory = self._patched_image()
+        self._load_memory(memory)
+
+        self._decoded = dict(self._image_decoded)
+        self._decoded_cells = set(self._image_cells)
+        self._from_image = True
+
+    def _set_image(self, image: Image) -> None:
+        """Replaces the program image, discarding changed inputs."""
+        self._image = image
+        self._digest: Optional[str] = None
+        self._patches: Dict[int, int] = {}
+        self._analysis: Optional[Analysis] = None
+
+        # instructions decoded from the (patched) image, valid after every reset
+        self._image_decoded: Dict[int, Instruction] = {}
+        self._image_cells: Set[int] = set()
+
+    def _image_digest(self) -> str:
+        """Gets the hash of the program image, without the changed inputs."""
+        if self._digest is None:
+            image = self._image
+            if isinstance(image, list):
+                data = ",".join(str(x) for x in image).encode()
+            else:
+                data = image.tobytes()
+            self._digest = hashlib.sha256(data).hexdigest()
+        return self._digest
+
+    def _patch(self, address: int, value: int) -> None:
+        """Changes a value of the program image, applied whenever memory is reset."""
+        self._patches[address] = value
+        if self._analysis is not None:
+            # decoded instructions are no longer guarded against writes
+            self._analysis = None
+            self._image_decoded = {}
+            self._image_cells = set()
+        else:
+            self._drop_decoded(self._image_decoded, address)
+
+    def _patched_image(self) -> Image:
+        """Copies the program image, with the changed inputs applied."""
+        image = self._image[:]
+        for address, value in self._patches.items():
+            image[address] = value
+        return image
+
+    def _load_memory(self, memory: MutableSequence[int]) -> None:
+        """Replaces the computer's memory, discarding decoded instructions.
+
+        The instruction pointer is set back to address 0.
+        """
+        self.memory = memory
+        self.pointer = 0
+        self.halted = False
+        self._compiled_engine: Optional[CompiledEngine] = None
+        self._decoded: Dict[int, Instruction] = {}
+        self._decoded_cells: Set[int] = set()
+        self._from_image = False
+
+    def _reset_io(self) -> None:
+        """Binds the input and output opcodes to the configured channels."""
+        self._bind_inputs()
+        self._bind_outputs()
+
+    def _replayable_inputs(self) -> Tuple[int, ...]:
+        """Gets the values of the input source, if they can be read again."""
+        source = self._inputs
+        if isinstance(source, (list, tuple, range, deque)):
+            return tuple(source)
+        return ()
+
+    def _bind_inputs(self) -> None:
+        """Binds the input opcode to the configured source."""
+        source = self._inputs
+        if source is None:
+            self._read = self._read_stdin
+        elif callable(source):
+            self._read = source
+        elif hasattr(source, "popleft"):
+            self._read = source.popleft
+        else:
+            self._read = iter(source).__next__
+
+    def _bind_outputs(self) -> None:
+        """Binds the output opcode to the configured sink."""
+        sink = self._outputs
+        if sink is None:
+            self._emit = print
+        elif callable(sink):
+            self._emit = sink
+        elif hasattr(sink, "append"):
+            self._emit = sink.append
+        else:
+            raise TypeError("Outputs must be callable or have an `append` method.")
+
+    @staticmethod
+    def _read_stdin() -> int:
+        """Reads an integer from stdin."""
+        try:
+            return int(input())
+        except ValueError:
+            raise ValueError("Input must be an integer.")
+
+    def _fetch(self, address: int) -> Instruction:
+        """Gets the instruction at a given address, decoding it if not cached.
+
+        Args:
+            address (int): Memory address where the instruction's opcode is located.
+
+        Returns:
+            Instruction: The decoded instruction.
+        """
+        try:
+            return self._decoded[address]
+        except KeyError:
+            pass
+
+        instruction = self._decode(address)
+        cells = range(address, address + instruction.n_params + 1)
+        self._decoded[address] = instruction
+        self._decoded_cells.update(cells)
+
+        if self._from_image and cells.stop <= len(self._image):
+            memory, image, patches = self.memory, self._image, self._patches
+            if all(memory[c] == patches.get(c, image[c]) for c in cells):
+                self._image_decoded[address] = instruction
+                self._image_cells.update(cells)
 
-    def _parse_op(self, address: int) -> Tuple[str, int]:
-        """Parses operation to find the modes and opcode.
+        return instruction
+
+    def _decode(self, address: int) -> Instruction:
+        """Decodes the instruction located at a given address.
 
         Args:
-            address (int): Memory address where operator information is located.
+            address (int): Memory address where the instruction's opcode is located.
 
         Returns:
-            Tuple[str, int]: Tuple containing the mode string and opcode integer.
+            Instruction: The decoded instruction.
         """
-        op = str(self.memory[address])
-        return op[:-2], int(op[-2:])
+        try:
+            op = self.memory[address]
+        except IndexError as err:
+            raise IndexError("Program has no halt opcode (99) at its end!") from err
+
+        opcode = opcode_of(op)
+        try:
+            n_params = self._arity[opcode]
+        except KeyError as err:
+            raise KeyError(
+                f"Opcode {opcode} not found! Instruction is invalid."
+            ) from err
+        self._validate_instruction(address, n_params)
+
+        modes = tuple(op // 10 ** (i + 2) % 10 for i in range(n_params))
+        params = tuple(self.memory[address + 1 : address + n_params + 1])
+
+        return Instruction(opcode, modes, n_params, params)
 
-    def _op_sum(self, address: int, modes: str) -> int:
+    def _load(self, instruction: Instruction, index: int) -> int:
+        """Gets the value of an instruction's parameter, according to its mode."""
+        param = instruction.params[index]
+        return param if instruction.modes[index] else self.memory[param]
+
+    def _write(self, address: int, value: int) -> None:
+        """Writes a value to memory, dropping any decoded instruction it overlaps.
+
+        If the value doesn't fit in the memory's 64-bit integers, the memory is
+        converted to a list of Python integers.
+        """
+        try:
+            self.memory[address] = value
+        except OverflowError:
+            self.memory = list(self.memory)
+            self.memory[address] = value
+
+        if address < 0:
+            # negative addresses are counted from the end, as in a list
+            address += len(self.memory)
+        if address in self._decoded_cells:
+            self._drop_decoded(self._decoded, address)
+
+    def _drop_decoded(self, decoded: Dict[int, Instruction], address: int) -> None:
+        """Drops the decoded instructions that overlap a given address."""
+        for start in range(address - self._max_params, address + 1):
+            instruction = decoded.get(start)
+            if instruction is not None and start + instruction.n_params >= address:
+                del decoded[start]
+
+    def _op_sum(self, address: int, instruction: Instruction) -> int:
         """Sum opcode.
 
         Sums the integers located in the addresses indicated by the
@@ -93,23 +683,17 @@ class IntcodeComputer:
         Args:
             address (int): Address of the opcode. Position of the parameters
                 will be relative to this address.
+            instruction (Instruction): The decoded instruction.
 
         Returns:
             (int) Number of parameters used by opcode.
         """
-        n_params = 3
-        self._validate_instruction(address, n_params)
-
-        *args, out = self.memory[address + 1 : address + n_params + 1]
-        args = [
-            self.memory[arg] if mode == "0" else arg
-            for arg, mode in zip(args, modes.zfill(n_params - 1)[::-1])
-        ]
-        self.memory[out] = args[0] + args[1]
+        args = self._load(instruction, 0), self._load(instruction, 1)
+        self._write(instruction.params[2], args[0] + args[1])
 
-        return n_params
+        return instruction.n_params
 
-    def _op_product(self, address: int, modes: str) -> int:
+    def _op_product(self, address: int, instruction: Instruction) -> int:
         """Product opcode.
 
         Calculates the product of the integers located in the addresses
@@ -119,105 +703,64 @@ class IntcodeComputer:
         Args:
             address (int): Address of the opcode. Position of the parameters
                 will be relative to this address.
+            instruction (Instruction): The decoded instruction.
 
         Returns:
             (int) Number of parameters used by opcode.
         """
-        n_params = 3
-        self._validate_instruction(address, n_params)
+        args = self._load(instruction, 0), self._load(instruction, 1)
+        self._write(instruction.params[2], args[0] * args[1])
 
-        *args, out = self.memory[address + 1 : address + n_params + 1]
-        args = [
-            self.memory[arg] if mode == "0" else arg
-            for arg, mode in zip(args, modes.zfill(n_params - 1)[::-1])
-        ]
-        self.memory[out] = args[0] * args[1]
-
-        return n_params
-
-    def _op_input(self, address: int, modes: str) -> int:
-        n_params = 1
-        self._validate_instruction(address, n_params)
+        return instruction.n_params
 
+    def _op_input(self, address: int, instruction: Instruction) -> int:
         try:
-            input_value = int(input())
-        except ValueError:
-            raise ValueError("Input must be an integer.")
-        out = self.memory[address + 1]
-        self.memory[out] = input_value
-
-        return n_params
-
-    def _op_output(self, address: int, modes: str) -> int:
-        n_params = 1
-        modes = modes.zfill(n_params)
-        self._validate_instruction(address, n_params)
+            input_value = self._read()
+        except (StopIteration, IndexError):
+            raise EOFError(f"No input left for the instruction in address {address}.")
+        self._write(instruction.params[0], input_value)
 
-        out = self.memory[address + 1] if modes[0] == "0" else address + 1
-        print(self.memory[out])
+        return instruction.n_params
 
-        return n_params
+    def _op_output(self, address: int, instruction: Instruction) -> int:
+        self._emit(self._load(instruction, 0))
 
-    def _op_jump_true(self, address: int, modes: str) -> int:
-        n_params = 2
-        self._validate_instruction(address, n_params)
+        return instruction.n_params
 
-        args = self.memory[address + 1 : address + n_params + 1]
-        args = [
-            self.memory[arg] if mode == "0" else arg
-            for arg, mode in zip(args, modes.zfill(n_params)[::-1])
-        ]
+    def _op_jump_true(self, address: int, instruction: Instruction) -> int:
+        args = self._load(instruction, 0), self._load(instruction, 1)
 
-        return (args[1] - address - 1) if args[0] else n_params
+        return (args[1] - address - 1) if args[0] else instruction.n_params
 
-    def _op_jump_false(self, address: int, modes: str) -> int:
-        n_params = 2
-        self._validate_instruction(address, n_params)
+    def _op_jump_false(self, address: int, instruction: Instruction) -> int:
+        args = self._load(instruction, 0), self._load(instruction, 1)
 
-        args = self.memory[address + 1 : address + n_params + 1]
-        args = [
-            self.memory[arg] if mode == "0" else arg
-            for arg, mode in zip(args, modes.zfill(n_params)[::-1])
-        ]
+        return (args[1] - address - 1) if not args[0] else instruction.n_params
 
-        return (args[1] - address - 1) if not args[0] else n_params
+    def _op_less_than(self, address: int, instruction: Instruction) -> int:
+        args = self._load(instruction, 0), self._load(instruction, 1)
+        self._write(instruction.params[2], 1 if args[0] < args[1] else 0)
 
-    def _op_less_than(self, address: int, modes: str) -> int:
-        n_params = 3
-        self._validate_instruction(address, n_params)
+        return instruction.n_params
 
-        *args, out = self.memory[address + 1 : address + n_params + 1]
-        args = [
-            self.memory[arg] if mode == "0" else arg
-            for arg, mode in zip(args, modes.zfill(n_params - 1)[::-1])
-        ]
-        self.memory[out] = 1 if args[0] < args[1] else 0
-
-        return n_params
-
-    def _op_equals(self, address: int, modes: str) -> int:
-        n_params = 3
-        self._validate_instruction(address, n_params)
+    def _op_equals(self, address: int, instruction: Instruction) -> int:
+        args = self._load(instruction, 0), self._load(instruction, 1)
+        self._write(instruction.params[2], 1 if args[0] == args[1] else 0)
 
-        *args, out = self.memory[address + 1 : address + n_params + 1]
-        args = [
-            self.memory[arg] if mode == "0" else arg
-            for arg, mode in zip(args, modes.zfill(n_params - 1)[::-1])
-        ]
-        self.memory[out] = 1 if args[0] == args[1] else 0
-
-        return n_params
+        return instruction.n_params
 
     def _validate_instruction(self, address: int, n_params: int) -> None:
         """Validates a given instruction based on the opcode's address.
 
         A valid instruction must have the necessary amount of parameters,
-        according to the opcode.
+        according to the opcode. Any instruction is valid in unbounded memory.
 
         Args:
             address (int): Instruction's opcode address
             n_params (int): Number of expected parameters following the opcode.
         """
+        if getattr(self.memory, "unbounded", False):
+            return
         mem_size = len(self.memory)
 
         if address + n_params >= mem_size:
@@ -227,6 +770,113 @@ class IntcodeComputer:
             )
 
 
+# state of a search worker process, set once by `_init_search_worker`
+_search_state: Dict[str, Any] = {}
+
+
+def _search_patches(
+    image: Image,
+    target: int,
+    addresses: Tuple[int, ...],
+    ranges: Tuple[List[int], ...],
+    workers: int = 1,
+    inputs: Tuple[int, ...] = (),
+) -> Optional[Tuple[int, ...]]:
+    """Searches for patch values that make a program output a given value.
+
+    Every combination of values from `ranges` is written to `addresses` before
+    running the program, and the integer left in address 0 is compared with
+    `target`. The search is split into chunks of values for the first address.
+    Combinations that make the program invalid are skipped, but running out of
+    inputs stops the search with an `EOFError`.
+
+    Args:
+        image (Image): The program image.
+        target (int): The expected output.
+        addresses (Tuple[int, ...]): Addresses to patch.
+        ranges (Tuple[List[int], ...]): Values to try for each address.
+        workers (int, optional): Number of processes. Defaults to 1.
+        inputs (Tuple[int, ...], optional): Values read by the input opcode on
+            every try. Defaults to no inputs.
+
+    Returns:
+        Optional[Tuple[int, ...]]: Matching patch values, or None if not found.
+    """
+    firsts, *rest = ranges
+    if workers <= 1:
+        _init_search_worker(image, addresses, inputs, None)
+        return _search_chunk(firsts, rest, target)
+
+    # a few chunks per worker, to balance load without much overhead
+    n_chunks = min(len(firsts), workers * 4)
+    chunks = [firsts[i::n_chunks] for i in range(n_chunks)]
+
+    context = multiprocessing.get_context()
+    stop = context.Event()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_search_worker,
+        initargs=(image, addresses, inputs, stop),
+    ) as executor:
+        pending = {executor.submit(_search_chunk, c, rest, target) for c in chunks}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                match = future.result()
+                if match is not None:
+                    stop.set()
+                    for future in pending:
+                        future.cancel()
+                    return match
+
+    return None
+
+
+def _init_search_worker(
+    image: Image, addresses: Tuple[int, ...], inputs: Tuple[int, ...], stop: Any
+) -> None:
+    """Prepares a search worker with its own computer and program image."""
+    computer = IntcodeComputer(inputs=inputs, outputs=lambda value: None)
+    computer._set_image(image)
+    _search_state["computer"] = computer
+    _search_state["addresses"] = addresses
+    _search_state["stop"] = stop
+
+
+def _search_chunk(
+    firsts: List[int], rest: List[List[int]], target: int
+) -> Optional[Tuple[int, ...]]:
+    """Tries every combination of patch values starting with one of `firsts`."""
+    computer = _search_state["computer"]
+    addresses = _search_state["addresses"]
+    stop = _search_state["stop"]
+
+    for values in product(firsts, *rest):
+        if stop is not None and stop.is_set():
+            return None
+
+        for address, value in zip(addresses, values):
+            computer._patch(address, value)
+        computer.reset()
+
+        try:
+            computer._run()
+        except (IndexError, KeyError):
+            continue
+        except EOFError:
+            if stop is not None:
+                stop.set()
+            raise
+
+        if computer.memory[0] == target:
+            if stop is not None:
+                stop.set()
+            return values
+
+    return None
+
+
 if __name__ == "__main__":
     # day 02
     print("Day 02")
@@ -238,11 +888,10 @@ if __name__ == "__main__":
         print(computer.memory[0])
 
         print("Challenge 2:")
-        for noun, verb in ((x, y) for x in range(0, 100) for y in range(0, 100)):
-            computer.change_inputs(noun, verb).execute()
-            if computer.memory[0] == 19690720:
-                print(noun * 100 + verb)
-                break
+        noun, verb = computer.solve_inputs(
+            19690720, workers=multiprocessing.cpu_count()
+        )
+        print(noun * 100 + verb)
 
     print("\nDay 05")
     # day 05
@@ -250,9 +899,9 @@ if __name__ == "__main__":
         computer = IntcodeComputer(f.read())
 
         print("Challenge 1:")
-        input = lambda: "1"  # monkey patched input function
+        computer.inputs = [1]
         computer.execute()
 
         print("Challenge 2:")
-        input = lambda: "5"  # monkey patched input function
+        computer.inputs = [5]
         computer.execute()
@@ -1,8 +1,243 @@
 from __future__ import annotations
 
-from typing import List
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 from functools import reduce
 
+import numpy as np
+
+Point = Tuple[int, int]
+
+# unit vector of each direction, as (x, y)
+DIRECTIONS = {"R": (1, 0), "L": (-1, 0), "U": (0, 1), "D": (0, -1)}
+# cells are packed as (x << 32) | (y + PACK_OFFSET), so coordinates must fit in
+# 32 bits
+PACK_OFFSET = 1 << 31
+
+
+class Segment(NamedTuple):
+    """Axis-aligned piece of a wire, drawn by a single instruction.
+
+    Attributes:
+        fixed (int): Coordinate shared by all of the segment's cells: y for
+            horizontal segments and x for vertical ones.
+        start (int): Other coordinate of the segment's first cell.
+        end (int): Other coordinate of the segment's last cell.
+        steps (int): Steps taken by the wire to reach the first cell.
+    """
+
+    fixed: int
+    start: int
+    end: int
+    steps: int
+
+    @property
+    def low(self) -> int:
+        return min(self.start, self.end)
+
+    @property
+    def high(self) -> int:
+        return max(self.start, self.end)
+
+    def steps_to(self, position: int) -> int:
+        """Gets the steps taken by the wire to reach a cell of the segment."""
+        return self.steps + abs(position - self.start)
+
+
+class Overlap(NamedTuple):
+    """Run of cells along a line shared by several wires.
+
+    The sum of the steps taken by the wires to reach a cell changes linearly
+    along the run, so it is kept as its value at the first cell and a slope.
+
+    Attributes:
+        horizontal (bool): Whether the cells run along x, with a fixed y.
+        fixed (int): Coordinate shared by all the cells.
+        low (int): Other coordinate of the first cell.
+        high (int): Other coordinate of the last cell.
+        steps (int): Sum of the steps taken to reach the first cell.
+        slope (int): Change of the sum of steps from one cell to the next.
+    """
+
+    horizontal: bool
+    fixed: int
+    low: int
+    high: int
+    steps: int
+    slope: int
+
+    @classmethod
+    def from_segment(cls, segment: Segment, horizontal: bool) -> Overlap:
+        """Creates the run of cells of a single wire's segment."""
+        slope = 1 if segment.start <= segment.end else -1
+        low, high = segment.low, segment.high
+        return cls(horizontal, segment.fixed, low, high, segment.steps_to(low), slope)
+
+    def point(self, position: int) -> Point:
+        """Gets the cell at a given position along the run."""
+        return (position, self.fixed) if self.horizontal else (self.fixed, position)
+
+    def steps_to(self, position: int) -> int:
+        """Gets the sum of the steps taken to reach a cell of the run."""
+        return self.steps + self.slope * (position - self.low)
+
+    def closest(self) -> int:
+        """Gets the smallest manhattan distance from the origin to a cell."""
+        nearest = (
+            0 if self.low <= 0 <= self.high else min(abs(self.low), abs(self.high))
+        )
+        return abs(self.fixed) + nearest
+
+    def shortest(self) -> int:
+        """Gets the smallest sum of steps to a cell, found at an end of the run."""
+        return min(self.steps, self.steps_to(self.high))
+
+
+class SegmentIndex:
+    """Segments of a wire, indexed by their fixed coordinate.
+
+    Memory is proportional to the number of instructions, however long they are.
+
+    Args:
+        wire (List[str]): The wire's instructions.
+    """
+
+    def __init__(self, wire: List[str]) -> None:
+        # segments by fixed coordinate, and the sorted fixed coordinates
+        self.horizontal: Dict[int, List[Segment]] = {}
+        self.vertical: Dict[int, List[Segment]] = {}
+
+        x = y = steps = 0
+        for d, *n in wire:
+            n = int("".join(n))
+            if n <= 0:
+                continue
+            dx, dy = DIRECTIONS[d]
+            if dy == 0:
+                segment = Segment(y, x + dx, x + dx * n, steps + 1)
+                self.horizontal.setdefault(y, []).append(segment)
+            else:
+                segment = Segment(x, y + dy, y + dy * n, steps + 1)
+                self.vertical.setdefault(x, []).append(segment)
+            x, y, steps = x + dx * n, y + dy * n, steps + n
+
+        self.ys = sorted(self.horizontal)
+        self.xs = sorted(self.vertical)
+
+    def runs(self) -> Iterator[Overlap]:
+        """Gets the cells of the wire, as one run per segment."""
+        for segments, horizontal in ((self.horizontal, True), (self.vertical, False)):
+            for group in segments.values():
+                for segment in group:
+                    yield Overlap.from_segment(segment, horizontal)
+
+    def overlaps(self, runs: Iterable[Overlap]) -> Iterator[Overlap]:
+        """Finds the parts of runs of cells that this wire also goes through.
+
+        Collinear segments give a run of cells, however long their overlap is,
+        and perpendicular ones give a single cell. A cell is found once for
+        every combination of segments sharing it.
+
+        Args:
+            runs (Iterable[Overlap]): Runs of cells shared by other wires.
+
+        Yields:
+            Overlap: Runs of cells shared with this wire, with its steps added.
+        """
+        for run in runs:
+            if run.horizontal:
+                collinear = self.horizontal.get(run.fixed, ())
+                across = self._vertical_between(run.low, run.high)
+            else:
+                collinear = self.vertical.get(run.fixed, ())
+                across = self._horizontal_between(run.low, run.high)
+
+            for segment in collinear:
+                low, high = max(run.low, segment.low), min(run.high, segment.high)
+                if low <= high:
+                    slope = 1 if segment.start <= segment.end else -1
+                    steps = run.steps_to(low) + segment.steps_to(low)
+                    yield run._replace(
+                        low=low, high=high, steps=steps, slope=run.slope + slope
+                    )
+            for position, segment in across:
+                if segment.low <= run.fixed <= segment.high:
+                    steps = run.steps_to(position) + segment.steps_to(run.fixed)
+                    yield run._replace(low=position, high=position, steps=steps)
+
+    def _vertical_between(self, low: int, high: int) -> Iterator[Tuple[int, Segment]]:
+        """Gets the vertical segments with x in a range."""
+        xs = self.xs
+        for x in xs[bisect_left(xs, low) : bisect_right(xs, high)]:
+            for segment in self.vertical[x]:
+                yield x, segment
+
+    def _horizontal_between(self, low: int, high: int) -> Iterator[Tuple[int, Segment]]:
+        """Gets the horizontal segments with y in a range."""
+        ys = self.ys
+        for y in ys[bisect_left(ys, low) : bisect_right(ys, high)]:
+            for segment in self.horizontal[y]:
+                yield y, segment
+
+
+class PackedWires:
+    """Cells visited by a group of wires, as packed 64-bit coordinates.
+
+    Each wire keeps its distinct cells as a sorted array of packed (x, y)
+    keys, with the steps taken to first reach each of them: 16 bytes per cell.
+
+    Args:
+        wires (List[List[str]]): The wires' instructions.
+    """
+
+    def __init__(self, wires: List[List[str]]) -> None:
+        self.keys: List[np.ndarray] = []
+        self.steps: List[np.ndarray] = []
+        for wire in wires:
+            keys, first_visits = np.unique(self._draw(wire), return_index=True)
+            self.keys.append(keys)
+            self.steps.append(first_visits + 1)
+
+        self._shared: Optional[Tuple[np.ndarray, ...]] = None
+
+    def shared(self, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Finds the cells visited by at least `k` wires.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Packed cells, and sum of the steps
+                taken by the wires visiting them to first reach them.
+        """
+        if self._shared is None:
+            keys = np.concatenate(self.keys)
+            order = np.argsort(keys, kind="stable")
+            cells, starts, counts = np.unique(
+                keys[order], return_index=True, return_counts=True
+            )
+            step_sums = np.add.reduceat(np.concatenate(self.steps)[order], starts)
+            self._shared = cells, counts, step_sums
+
+        cells, counts, step_sums = self._shared
+        shared = counts >= k
+        return cells[shared], step_sums[shared]
+
+    @staticmethod
+    def unpack(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Gets the x and y coordinates of packed cells."""
+        return keys >> 32, (keys & 0xFFFFFFFF) - PACK_OFFSET
+
+    @staticmethod
+    def _draw(wire: List[str]) -> np.ndarray:
+        """Draws a wire's path as packed cells, in order."""
+        lengths = np.array([max(int(i[1:]), 0) for i in wire], dtype=np.int64)
+        vectors = np.array([DIRECTIONS[i[0]] for i in wire], dtype=np.int64)
+        vectors = vectors.reshape(-1, 2)
+        x = np.cumsum(np.repeat(vectors[:, 0], lengths))
+        y = np.cumsum(np.repeat(vectors[:, 1], lengths))
+
+        if len(x) and max(np.abs(x).max(), np.abs(y).max()) >= PACK_OFFSET:
+            raise ValueError("Wire coordinates must fit in 32 bits.")
+        return (x << 32) | (y + PACK_OFFSET)
+
 
 class WireIntersections:
     """Supports identification of path intersections for a list of wires.
@@ -12,26 +247,142 @@ class WireIntersections:
             instructions in the form of <direction><number of steps>,
             where direction is one of right ('R'), left ('L'), up ('U')
             or down ('D'). Example: ['R4', 'U3', 'D10'].
+        engine (str, optional): One of "cells", "segments" or "numpy". The
+            cells engine draws every grid cell crossed by the wires. The
+            segments engine keeps each wire as a list of segments, indexed by
+            coordinate, so its cost grows with the number of instructions
+            rather than with their length. The numpy engine keeps the cells
+            as packed arrays, and can find cells shared by only some of the
+            wires. Defaults to "cells".
     """
 
-    def __init__(self, wires: List[List[str]]) -> None:
-        self._draw_paths(wires)
-
-    def find_closest(self) -> int:
-        """Calculates the smallest distance from the origin to an intersection."""
-        intersections = reduce(lambda x, y: set(x) & set(y), self.coords)
-        return min(self._manhattan(i) for i in intersections)
-
-    def find_shortest(self) -> int:
-        """Calculates the shortest path to an intersection."""
-        intersections = reduce(lambda x, y: set(x) & set(y), self.coords)
-        return min(
-            sum(wire_path.index(i) + 1 for wire_path in self.coords)
-            for i in intersections
-        )
+    engines = ("cells", "segments", "numpy")
+
+    def __init__(self, wires: List[List[str]], engine: str = "cells") -> None:
+        if engine not in self.engines:
+            raise ValueError(f"Engine must be one of {self.engines}, not {engine!r}.")
+
+        self.engine = engine
+        self.n_wires = len(wires)
+        self._intersections: Optional[Dict[complex, int]] = None
+        self._overlaps: Optional[List[Overlap]] = None
+        if engine == "segments":
+            self.segments = [SegmentIndex(wire) for wire in wires]
+        elif engine == "numpy":
+            self.packed = PackedWires(wires)
+        else:
+            self._draw_paths(wires)
+
+    def find_closest(self, k: Optional[int] = None) -> int:
+        """Calculates the smallest distance from the origin to an intersection.
+
+        Args:
+            k (int, optional): Minimum number of wires crossing an intersection.
+                Only supported by the numpy engine. Defaults to all wires.
+        """
+        if self.engine == "numpy":
+            x, y = self.packed.unpack(self._shared(k)[0])
+            return int((np.abs(x) + np.abs(y)).min())
+
+        self._check_all_wires(k)
+        if self.engine == "segments":
+            return min(overlap.closest() for overlap in self._find_overlaps())
+        return min(self._manhattan(i) for i in self.intersections)
+
+    def find_shortest(self, k: Optional[int] = None) -> int:
+        """Calculates the shortest path to an intersection.
+
+        Args:
+            k (int, optional): Minimum number of wires crossing an intersection.
+                Only the steps of these wires count. Only supported by the
+                numpy engine. Defaults to all wires.
+        """
+        if self.engine == "numpy":
+            return int(self._shared(k)[1].min())
+
+        self._check_all_wires(k)
+        if self.engine == "segments":
+            return min(overlap.shortest() for overlap in self._find_overlaps())
+        return min(self.intersections.values())
+
+    @property
+    def intersections(self) -> Dict[complex, int]:
+        """Sum of the steps taken by the wires to first reach each intersection.
+
+        Intersections are keyed by their coordinates, as complex(y, x). They are
+        found once, on first use. With the segments engine, this lists every
+        cell of collinear overlaps, which `find_closest` and `find_shortest`
+        avoid.
+        """
+        if self._intersections is None:
+            if self.engine == "segments":
+                self._intersections = self._overlap_cells()
+            elif self.engine == "numpy":
+                cells, step_sums = self._shared()
+                x, y = self.packed.unpack(cells)
+                self._intersections = {
+                    complex(*cell): steps
+                    for cell, steps in zip(
+                        zip(y.tolist(), x.tolist()), step_sums.tolist()
+                    )
+                }
+            else:
+                self._intersections = self._find_common_cells()
+            if not self._intersections:
+                raise ValueError("Wires don't intersect.")
+
+        return self._intersections
+
+    def _shared(self, k: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Finds the cells shared by at least `k` wires, by default all of them."""
+        cells, step_sums = self.packed.shared(self.n_wires if k is None else k)
+        if not len(cells):
+            raise ValueError("Wires don't intersect.")
+        return cells, step_sums
+
+    def _check_all_wires(self, k: Optional[int]) -> None:
+        """Checks that intersections are requested for all wires."""
+        if k is not None and k != self.n_wires:
+            raise ValueError("Only the numpy engine finds cells shared by some wires.")
+
+    def _find_common_cells(self) -> Dict[complex, int]:
+        """Finds the cells crossed by every wire, from their first-visit steps."""
+        common = reduce(lambda x, y: x & y.keys(), self.steps[1:], self.steps[0].keys())
+        return {cell: sum(steps[cell] for steps in self.steps) for cell in common}
+
+    def _find_overlaps(self) -> List[Overlap]:
+        """Finds the runs of cells crossed by every wire, from their segments."""
+        if self._overlaps is None:
+            first, *others = self.segments
+            if not others:
+                raise ValueError("At least two wires are needed.")
+
+            runs: Iterable[Overlap] = first.runs()
+            for wire in others:
+                runs = wire.overlaps(runs)
+            self._overlaps = list(runs)
+            if not self._overlaps:
+                raise ValueError("Wires don't intersect.")
+
+        return self._overlaps
+
+    def _overlap_cells(self) -> Dict[complex, int]:
+        """Lists the cells of the runs crossed by every wire, with their steps."""
+        intersections: Dict[complex, int] = {}
+        for overlap in self._find_overlaps():
+            for position in range(overlap.low, overlap.high + 1):
+                x, y = overlap.point(position)
+                steps = overlap.steps_to(position)
+                cell = complex(y, x)
+                intersections[cell] = min(intersections.get(cell, steps), steps)
+        return intersections
 
     def _draw_paths(self, wires: List[List[str]]) -> None:
-        """Draws the wire paths as an ordered list of grid coordinates."""
+        """Draws the wire paths as an ordered list of grid coordinates.
+
+        The steps taken by each wire to first reach each of its cells are
+        indexed along the way.
+        """
         pos = complex  # position vector alias
         dirs = {
             "R": pos(0, 1),
@@ -52,6 +403,11 @@ class WireIntersections:
             coords.append(wire_path)
 
         self.coords = coords
+        # later visits are overwritten by earlier ones
+        self.steps = [
+            dict(zip(reversed(wire_path), range(len(wire_path), 0, -1)))
+            for wire_path in coords
+        ]
 
     @staticmethod
     def _manhattan(position: complex) -> int:
@@ -62,7 +418,7 @@ class WireIntersections:
 if __name__ == "__main__":
     with open("data/day_03_wires.txt", "r") as f:
         wires = [wire.split(",") for wire in f.read().split("\n")]
-        wire_intersections = WireIntersections(wires)
+        wire_intersections = WireIntersections(wires, engine="segments")
 
         print("Challenge 1:")
         print(wire_intersections.find_closest())
@@ -1,6 +1,6 @@
 from typing import Optional, Tuple, List, Iterator
 
-from itertools import chain
+from functools import lru_cache
 
 
 class CodeBreaker:
@@ -18,46 +18,132 @@ class CodeBreaker:
         self.length = length
         self.valid_range = valid_range if valid_range else ("0" * length, "9" * length)
 
-    def valid_passwords(self, strict: bool = False) -> List[str]:
-        """Generates list of valid passwords, according to constraints.
+    def valid_passwords(self, strict: bool = False) -> Iterator[str]:
+        """Generates valid passwords, according to constraints.
+
+        Passwords are generated lazily, in lexicographic order. Only the
+        non-decreasing digit strings inside the range are enumerated.
 
         Args:
             strict (bool, optional): Set to True for more restrictive constraints.
                 In this case`Defaults to False.
 
         Returns:
-            List[str]: List of valid passwords.
+            Iterator[str]: Valid passwords.
         """
-        if strict:
-            return [
-                pw
-                for pw in self._generate_candidates()
-                if self._is_non_dec(pw) and self._has_adj_strict(pw)
-            ]
-        else:
-            return [
-                pw
-                for pw in self._generate_candidates()
-                if self._is_non_dec(pw) and self._has_adj(pw)
-            ]
-
-    def _generate_candidates(self) -> Iterator:
-        """Generates password candidates inside defined range."""
-        adj_range = (
-            max(int(self.valid_range[0]), int("1" * self.length)),
-            int(self.valid_range[1]) + 1,
-        )
-        candidates = (str(x) for x in range(*adj_range))
+        has_adj = self._has_adj_strict if strict else self._has_adj
+        return (pw for pw in self._generate_candidates() if has_adj(pw))
+
+    def count_valid(self, strict: bool = False) -> int:
+        """Counts valid passwords, according to constraints, without generating them.
+
+        Passwords are counted digit by digit, with dynamic programming over the
+        last digit, the length of its run, whether a valid run was seen yet,
+        and whether the digits so far are tight to either bound of the range.
+
+        Args:
+            strict (bool, optional): Set to True for more restrictive constraints.
+                Defaults to False.
+
+        Returns:
+            int: Number of valid passwords.
+        """
+        has_adj = self._has_adj_strict if strict else self._has_adj
+        count = 0
+        if int(self.valid_range[0]) == 0 and has_adj("0" * self.length):
+            count += 1
+
+        low = max(int(self.valid_range[0]), int("1" * self.length))
+        high = min(int(self.valid_range[1]), int("9" * self.length))
+        if low > high:
+            return count
+        low_digits, high_digits = str(low), str(high)
+
+        @lru_cache(maxsize=None)
+        def count_from(
+            pos: int, last: int, run: int, seen: bool, tight_low: bool, tight_high: bool
+        ) -> int:
+            """Counts the valid completions of a prefix, given its state.
+
+            Runs longer than 2 are all counted as 3, and `seen` tells whether the
+            prefix already has a valid run (of exactly two digits, if strict).
+            """
+            if pos == self.length:
+                return int(seen or (strict and run == 2))
+
+            low_digit = int(low_digits[pos]) if tight_low else 0
+            high_digit = int(high_digits[pos]) if tight_high else 9
+            total = 0
+            for digit in range(max(last, low_digit), high_digit + 1):
+                if digit == last:
+                    next_run = min(run + 1, 3)
+                    next_seen = seen or (not strict and next_run >= 2)
+                else:
+                    next_run = 1
+                    next_seen = seen or (strict and run == 2)
+                total += count_from(
+                    pos + 1,
+                    digit,
+                    next_run,
+                    next_seen,
+                    tight_low and digit == low_digit,
+                    tight_high and digit == high_digit,
+                )
+            return total
+
+        return count + count_from(0, 0, 0, False, True, True)
+
+    def _generate_candidates(self) -> Iterator[str]:
+        """Generates non-decreasing password candidates inside defined range.
+
+        Apart from the all-zero password, candidates have no zeros, as they
+        can't start with one.
+        """
+        low = max(int(self.valid_range[0]), int("1" * self.length))
+        high = min(int(self.valid_range[1]), int("9" * self.length))
 
         if int(self.valid_range[0]) == 0:
-            # minor manual optimization
-            return chain(["0" * self.length], candidates)
-        else:
-            return candidates
+            yield "0" * self.length
+        if low <= high:
+            yield from self._non_dec_between(str(low), str(high), [], 1, True, True)
+
+    def _non_dec_between(
+        self,
+        low: str,
+        high: str,
+        prefix: List[str],
+        min_digit: int,
+        tight_low: bool,
+        tight_high: bool,
+    ) -> Iterator[str]:
+        """Generates the non-decreasing strings between two bounds, given a prefix.
 
-    def _is_non_dec(self, pw: str) -> bool:
-        """Check if password is non-decreasing."""
-        return pw == "".join(sorted(pw))
+        Args:
+            low (str): Lower bound.
+            high (str): Upper bound.
+            prefix (List[str]): Digits chosen so far.
+            min_digit (int): Smallest allowed next digit.
+            tight_low (bool): Whether the prefix equals the start of `low`.
+            tight_high (bool): Whether the prefix equals the start of `high`.
+        """
+        pos = len(prefix)
+        if pos == self.length:
+            yield "".join(prefix)
+            return
+
+        low_digit = int(low[pos]) if tight_low else 0
+        high_digit = int(high[pos]) if tight_high else 9
+        for digit in range(max(min_digit, low_digit), high_digit + 1):
+            prefix.append(str(digit))
+            yield from self._non_dec_between(
+                low,
+                high,
+                prefix,
+                digit,
+                tight_low and digit == low_digit,
+                tight_high and digit == high_digit,
+            )
+            prefix.pop()
 
     def _has_adj(self, pw: str) -> bool:
         """Check if identical digits are adjacent to each other."""
@@ -77,7 +163,7 @@ if __name__ == "__main__":
     breaker = CodeBreaker(length=6, valid_range=("278384", "824795"))
 
     print("Challenge 1:")
-    print(len(breaker.valid_passwords()))
+    print(breaker.count_valid())
 
     print("Challenge 2:")
-    print(len(breaker.valid_passwords(strict=True)))
+    print(breaker.count_valid(strict=True))
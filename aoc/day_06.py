@@ -1,6 +1,5 @@
-from typing import List
-
-from functools import reduce
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
 
 
 class OrbitMap:
@@ -11,7 +10,10 @@ class OrbitMap:
             of "A)B", meaning 'B' orbits 'A'. Relationships are separated by line.
     """
     def __init__(self, orbits: str) -> None:
-        self.map = self._parse_map(orbits)
+        self.parents, self.depths = self._parse_map(orbits)
+        self._index: Optional[Dict[str, int]] = None
+        self._depths: List[int] = []
+        self._ancestors: List[List[int]] = []
 
     def count_orbits(self) -> int:
         """Counts the number of direct and indirect orbits.
@@ -19,7 +21,7 @@ class OrbitMap:
         Returns:
             int: Number of orbits.
         """
-        return sum(len(path) - 1 for path in self.map)
+        return sum(self.depths.values())
 
     def shortest_path(self, begin: str, end: str) -> int:
         """Finds the length of the shortest path between two objects.
@@ -33,40 +35,105 @@ class OrbitMap:
         Returns:
             int: Distance in orbital jumps.
         """
-        endpoints = [begin, end]
-        paths = [path for path in self.map if path[-1] in endpoints]
-
-        if set(endpoints) != {path[-1] for path in paths}:
-            raise ValueError(
-                f"Both {begin} and {end} need to exist as objects in the orbit map!"
-            )
-
-        total_depth = sum(len(path) - 1 for path in paths)
-        common_path = len(reduce(lambda x, y: set(x) & set(y), paths))
+        return self.shortest_paths([(begin, end)])[0]
 
-        return total_depth - 2 * common_path
+    def shortest_paths(self, pairs: Iterable[Tuple[str, str]]) -> List[int]:
+        """Finds the length of the shortest path between each pair of objects.
 
-    def _parse_map(self, orbits: str) -> List[List[str]]:
-        """Parses orbit map from string to list of orbit chains."""
-        pairs = [orbit.split(")") for orbit in orbits.split("\n")]
+        An ancestor index is built on the first query, after which each pair
+        costs O(log n) jumps to find its closest common ancestor.
 
-        paths = [["COM"]]
-        while pairs:
-            path_ends = [path[-1] for path in paths]
-            to_add = [pair for pair in pairs if pair[0] in path_ends]
-
-            paths.extend(
-                [
-                    path + [new[1]]
-                    for path in paths
-                    for new in to_add
-                    if new[0] == path[-1]
-                ]
-            )
+        Args:
+            pairs (Iterable[Tuple[str, str]]): Begin and end objects of each path.
 
-            pairs = [pair for pair in pairs if pair not in to_add]
+        Returns:
+            List[int]: Distance in orbital jumps for each pair.
+        """
+        if self._index is None:
+            self._build_index()
+
+        distances = []
+        for begin, end in pairs:
+            if begin not in self._index or end not in self._index:
+                raise ValueError(
+                    f"Both {begin} and {end} need to exist as objects in the orbit map!"
+                )
+
+            common = self._common_ancestor(self._index[begin], self._index[end])
+            common_path = self._depths[common] + 1
+            distances.append(self.depths[begin] + self.depths[end] - 2 * common_path)
+
+        return distances
+
+    def _build_index(self) -> None:
+        """Builds the binary lifting table of 2^k-th ancestors of each object."""
+        # depths were filled in breadth-first order, so "COM" is index 0
+        names = list(self.depths)
+        self._index = {name: i for i, name in enumerate(names)}
+        self._depths = [self.depths[name] for name in names]
+
+        parents = [0] + [self._index[self.parents[name]] for name in names[1:]]
+        self._ancestors = [parents]
+        for _ in range(1, max(self._depths).bit_length()):
+            parents = [parents[parent] for parent in parents]
+            self._ancestors.append(parents)
+
+    def _common_ancestor(self, a: int, b: int) -> int:
+        """Finds the closest common ancestor of two indexed objects."""
+        if self._depths[a] < self._depths[b]:
+            a, b = b, a
+
+        # lift the deeper object to the same depth as the other
+        diff = self._depths[a] - self._depths[b]
+        level = 0
+        while diff:
+            if diff & 1:
+                a = self._ancestors[level][a]
+            diff >>= 1
+            level += 1
+
+        if a == b:
+            return a
+
+        for ancestors in reversed(self._ancestors):
+            if ancestors[a] != ancestors[b]:
+                a, b = ancestors[a], ancestors[b]
+
+        return self._ancestors[0][a]
+
+    def _parse_map(self, orbits: str) -> Tuple[Dict[str, str], Dict[str, int]]:
+        """Parses orbit map from string to the object each object orbits.
+
+        Depths (number of direct and indirect orbits) are found in a single
+        breadth-first pass from "COM". Blank lines are skipped.
 
-        return paths
+        Returns:
+            Tuple[Dict[str, str], Dict[str, int]]: Parent and depth of each object.
+        """
+        parents: Dict[str, str] = {}
+        children: Dict[str, list] = {}
+        for orbit in orbits.split("\n"):
+            if not orbit.strip():
+                continue
+            center, satellite = orbit.strip().split(")")
+            if satellite in parents:
+                raise ValueError(f"{satellite} orbits more than one object!")
+            parents[satellite] = center
+            children.setdefault(center, []).append(satellite)
+
+        depths = {"COM": 0}
+        queue = deque(["COM"])
+        while queue:
+            center = queue.popleft()
+            for satellite in children.get(center, ()):
+                depths[satellite] = depths[center] + 1
+                queue.append(satellite)
+
+        if len(depths) != len(parents) + 1:
+            lost = sorted(set(parents) - set(depths))[:5]
+            raise ValueError(f"Objects not orbiting COM: {', '.join(lost)}")
+
+        return parents, depths
 
 
 if __name__ == "__main__":
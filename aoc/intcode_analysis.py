@@ -0,0 +1,247 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Dict, List, Set, Type
+
+from aoc.intcode_memory import Image
+from aoc.intcode_opcodes import ARITY, HALT, JUMPS, WRITES, opcode_name, opcode_of
+
+if TYPE_CHECKING:
+    from aoc.day_02 import Instruction, IntcodeComputer
+
+# number of data values per line of a disassembly
+DATA_PER_LINE = 8
+
+
+class Analysis:
+    """Static analysis of an Intcode program.
+
+    Code is found by following every path from address 0: both sides of
+    conditional jumps, and the only side of jumps whose condition is an
+    immediate value. Jump targets in position mode are read from the image.
+    Every write goes to the address in its instruction's last parameter, so
+    the set of addresses that may be written is known, as long as no code is
+    written before it runs.
+
+    Attributes:
+        instructions (Dict[int, Instruction]): Reachable instructions, by address.
+        jump_targets (Set[int]): Addresses that jumps may go to.
+        blocks (List[range]): Cells of each basic block, in address order.
+        written (Set[int]): Addresses that may be written by the program.
+        invalid (Set[int]): Reachable addresses without a valid instruction.
+        unresolved (Set[int]): Addresses of jumps whose target isn't known, as
+            it is read from an address that may be written.
+        static (bool): Whether every instruction is proven to run as found in
+            the image. Code may still be written after its last run: that's the
+            case of instructions only run once, at the start of the program.
+    """
+
+    def __init__(self) -> None:
+        self.instructions: Dict[int, Instruction] = {}
+        self.jump_targets: Set[int] = set()
+        self.blocks: List[range] = []
+        self.written: Set[int] = set()
+        self.invalid: Set[int] = set()
+        self.unresolved: Set[int] = set()
+        self.static = False
+
+    def never_written(self, address: int) -> bool:
+        """Checks whether an address is proven to keep its initial value."""
+        return self.static and address not in self.written
+
+
+def analyze(computer: IntcodeComputer) -> Analysis:
+    """Analyzes a computer's program statically, with its changed inputs applied.
+
+    Every cell is visited a bounded number of times, so the analysis runs in
+    linear time.
+
+    Args:
+        computer (IntcodeComputer): The computer whose program is analyzed.
+
+    Returns:
+        Analysis: The analysis.
+    """
+    from aoc.day_02 import Instruction
+
+    image = computer._patched_image()
+    size = len(image)
+    analysis = Analysis()
+    instructions = analysis.instructions
+    # addresses of the instructions writing to each address
+    writers: Dict[int, List[int]] = {}
+    # jumps whose target was read from the image, by address of the target
+    target_cells: Dict[int, int] = {}
+    ends_block = bytearray(size + 1)
+
+    pending = [0]
+    while pending:
+        address = pending.pop()
+        if address in instructions or address in analysis.invalid:
+            continue
+        try:
+            instruction = _decode(computer, image, address, Instruction)
+        except (IndexError, KeyError):
+            analysis.invalid.add(address)
+            continue
+
+        instructions[address] = instruction
+        opcode, params = instruction.opcode, instruction.params
+        next_address = address + instruction.n_params + 1
+
+        if opcode == HALT:
+            ends_block[address] = 1
+            continue
+        if opcode in WRITES:
+            if -size <= params[-1] < size:
+                writers.setdefault(params[-1] % size, []).append(address)
+        if opcode not in JUMPS:
+            pending.append(next_address)
+            continue
+
+        ends_block[address] = 1
+        condition, target = params
+        if instruction.modes[1]:
+            targets = [target]
+        elif 0 <= target < size:
+            target_cells[target] = address
+            targets = [image[target]]
+        else:
+            analysis.unresolved.add(address)
+            targets = []
+
+        if instruction.modes[0]:
+            # the jump always goes the same way
+            if bool(condition) != (opcode == 5):
+                targets = [next_address]
+        else:
+            targets.append(next_address)
+
+        for target in targets:
+            if target != next_address:
+                analysis.jump_targets.add(target)
+            pending.append(target)
+
+    analysis.written.update(writers)
+    for target_cell, address in target_cells.items():
+        if target_cell in writers:
+            analysis.unresolved.add(address)
+
+    analysis.blocks = _blocks(analysis, ends_block, size)
+    analysis.static = not analysis.unresolved and _code_unchanged(analysis, writers)
+    return analysis
+
+
+def disassemble(computer: IntcodeComputer) -> str:
+    """Turns a computer's program into readable instructions.
+
+    Reachable instructions are shown one per line, by address, with their name
+    and parameters: position-mode ones in brackets, immediate ones as they are.
+    Jump targets are marked with ">". Other cells are shown as data.
+
+    Args:
+        computer (IntcodeComputer): The computer whose program is disassembled.
+
+    Returns:
+        str: The disassembly, one line per instruction or run of data values.
+    """
+    analysis = analyze(computer)
+    image = computer._patched_image()
+    lines = []
+    data: List[int] = []
+
+    address = 0
+    while address < len(image):
+        instruction = analysis.instructions.get(address)
+        if instruction is None:
+            if not data:
+                data_start = address
+            data.append(image[address])
+            address += 1
+            if len(data) == DATA_PER_LINE or address in analysis.instructions:
+                lines.append(_line(data_start, "data", [str(x) for x in data]))
+                data = []
+            continue
+
+        if data:
+            lines.append(_line(data_start, "data", [str(x) for x in data]))
+            data = []
+        operands = [
+            str(param) if mode else f"[{param}]"
+            for param, mode in zip(instruction.params, instruction.modes)
+        ]
+        marker = ">" if address in analysis.jump_targets else " "
+        lines.append(_line(address, opcode_name(instruction.opcode), operands, marker))
+        address += instruction.n_params + 1
+
+    if data:
+        lines.append(_line(data_start, "data", [str(x) for x in data]))
+    return "\n".join(lines)
+
+
+def _decode(
+    computer: IntcodeComputer,
+    image: Image,
+    address: int,
+    instruction_type: Type[Instruction],
+) -> Instruction:
+    """Decodes the instruction at a given address of an image, as the computer would."""
+    if address < 0:
+        raise IndexError(f"Address {address} is out of memory.")
+    op = image[address]
+    opcode = opcode_of(op)
+    n_params = ARITY[opcode]
+    if address + n_params >= len(image):
+        raise IndexError(f"Operator in address {address} is missing parameters.")
+
+    modes = tuple(op // 10 ** (i + 2) % 10 for i in range(n_params))
+    params = tuple(image[address + 1 : address + n_params + 1])
+    return instruction_type(opcode, modes, n_params, params)
+
+
+def _blocks(analysis: Analysis, ends_block: bytearray, size: int) -> List[range]:
+    """Splits the reachable instructions into basic blocks."""
+    instructions, targets = analysis.instructions, analysis.jump_targets
+    blocks = []
+    start = None
+    for address in range(size):
+        instruction = instructions.get(address)
+        if instruction is None:
+            continue
+        if start is not None and address in targets:
+            blocks.append(range(start, address))
+            start = None
+        if start is None:
+            start = address
+        end = address + instruction.n_params + 1
+        if ends_block[address] or end not in instructions:
+            blocks.append(range(start, end))
+            start = None
+    return blocks
+
+
+def _code_unchanged(analysis: Analysis, writers: Dict[int, List[int]]) -> bool:
+    """Checks that no instruction is written before it runs.
+
+    Instructions of the first block run once, in order, before any other code,
+    unless the block is a jump target. Writes to them are harmless if made by
+    later instructions: by themselves, the rest of the first block, or any
+    other block.
+    """
+    instructions = analysis.instructions
+    run_once: Set[int] = set()
+    first_block = analysis.blocks[0] if analysis.blocks else range(0)
+    if first_block.start == 0 and 0 not in analysis.jump_targets:
+        run_once = {a for a in first_block if a in instructions}
+
+    if any(address in writers for address in analysis.invalid):
+        return False
+    for address, instruction in instructions.items():
+        for cell in range(address, address + instruction.n_params + 1):
+            for writer in writers.get(cell, ()):
+                if address not in run_once or writer in run_once and writer < address:
+                    return False
+    return True
+
+
+def _line(address: int, name: str, operands: List[str], marker: str = " ") -> str:
+    """Formats a line of a disassembly."""
+    return f"{address:>8} {marker} {name:<12}{', '.join(operands)}".rstrip()
@@ -0,0 +1,205 @@
+from __future__ import annotations
+from collections import OrderedDict
+import hashlib
+import json
+import os
+from typing import TYPE_CHECKING, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from aoc.day_02 import IntcodeComputer
+
+# input sources whose values are fully known before the program runs
+CACHEABLE_INPUTS = (list, tuple, range)
+
+
+class CachedRun(NamedTuple):
+    """Result of running a program until it halts."""
+
+    outputs: Tuple[int, ...]
+    memory_digest: str
+
+
+class IntcodeCache:
+    """Cache of the results of running Intcode programs, keyed by their content.
+
+    A run is identified by the hash of the program image, its changed inputs
+    (see `IntcodeComputer.change_inputs`), its memory model and the values of
+    its input source.
+    Its result is the sequence of output values and a digest of the final memory.
+
+    Results are kept in memory, evicting the least recently used ones, and can
+    also be stored on disk, as one JSON file per run: once the files exceed a
+    given size, the least recently used ones are removed.
+
+    Only lists, tuples and ranges of inputs are part of the key. Programs that
+    read from any other source (stdin, a callable, an iterator or a deque) read
+    input from outside the machine: their runs are marked as uncacheable.
+
+    Args:
+        maxsize (int, optional): Maximum number of results kept in memory.
+            Defaults to 256.
+        path (str, optional): Directory of the on-disk store. Defaults to None,
+            for no on-disk store.
+        max_bytes (int, optional): Maximum total size of the on-disk store.
+            Defaults to 16 MiB.
+
+    Attributes:
+        hits (int): Number of runs found in the cache.
+        misses (int): Number of cacheable runs not found in the cache.
+    """
+
+    def __init__(
+        self, maxsize: int = 256, path: Optional[str] = None, max_bytes: int = 1 << 24
+    ) -> None:
+        self.maxsize = maxsize
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._results: OrderedDict[str, CachedRun] = OrderedDict()
+        self._uncacheable: Set[str] = set()
+
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+    def execute(self, computer: IntcodeComputer) -> CachedRun:
+        """Runs the computer's program from its initial state, unless cached.
+
+        On a miss, the computer is run as by `IntcodeComputer.execute` and its
+        result stored. On a hit, the computer isn't run: the cached outputs are
+        sent to its output sink, and its memory is left as it was.
+
+        Args:
+            computer (IntcodeComputer): The computer to run.
+
+        Returns:
+            CachedRun: The outputs and final memory digest of the run.
+        """
+        key = self.key(computer)
+        if key not in self._uncacheable:
+            result = self._get(key)
+            if result is not None:
+                self.hits += 1
+                for value in result.outputs:
+                    computer._emit(value)
+                return result
+            self.misses += 1
+
+        outputs: List[int] = []
+        external = not isinstance(computer.inputs, CACHEABLE_INPUTS)
+        read_outside = False
+        computer.reset()
+        read, emit = computer._read, computer._emit
+
+        def record_read() -> int:
+            nonlocal read_outside
+            read_outside = external
+            return read()
+
+        def record_emit(value: int) -> None:
+            outputs.append(value)
+            emit(value)
+
+        computer._read, computer._emit = record_read, record_emit
+        try:
+            computer._run()
+        finally:
+            computer._reset_io()
+
+        result = CachedRun(tuple(outputs), _digest(computer.memory))
+        if read_outside:
+            self._uncacheable.add(key)
+        else:
+            self._put(key, result)
+        return result
+
+    @staticmethod
+    def key(computer: IntcodeComputer) -> str:
+        """Gets the cache key of running a computer's program from its initial state.
+
+        Args:
+            computer (IntcodeComputer): The computer.
+
+        Returns:
+            str: The key.
+        """
+        inputs = computer.inputs
+        values = list(inputs) if isinstance(inputs, CACHEABLE_INPUTS) else "external"
+
+        patches = sorted(computer._patches.items())
+        model = computer.memory_model
+        data = f"{computer._image_digest()}|{patches}|{model}|{values}"
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def clear(self) -> None:
+        """Removes every result, including the on-disk store."""
+        self._results.clear()
+        self._uncacheable.clear()
+        for file_path in self._files():
+            os.remove(file_path)
+
+    def _get(self, key: str) -> Optional[CachedRun]:
+        """Gets a stored result, marking it as recently used."""
+        result = self._results.get(key)
+        if result is not None:
+            self._results.move_to_end(key)
+            return result
+        if self.path is None:
+            return None
+
+        file_path = os.path.join(self.path, f"{key}.json")
+        try:
+            with open(file_path, "r") as f:
+                data = json.load(f)
+            os.utime(file_path)
+        except (OSError, ValueError):
+            return None
+
+        result = CachedRun(tuple(data["outputs"]), data["memory_digest"])
+        self._remember(key, result)
+        return result
+
+    def _put(self, key: str, result: CachedRun) -> None:
+        """Stores a result, evicting the least recently used ones if full."""
+        self._remember(key, result)
+        if self.path is None:
+            return
+
+        file_path = os.path.join(self.path, f"{key}.json")
+        temp_path = f"{file_path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(result._asdict(), f)
+        os.replace(temp_path, file_path)
+        self._evict()
+
+    def _remember(self, key: str, result: CachedRun) -> None:
+        """Keeps a result in memory, evicting the least recently used one if full."""
+        self._results[key] = result
+        self._results.move_to_end(key)
+        if len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+
+    def _evict(self) -> None:
+        """Removes the least recently used files until the store fits its size."""
+        files = [(os.stat(file_path), file_path) for file_path in self._files()]
+        total = sum(stat.st_size for stat, _ in files)
+        for stat, file_path in sorted(files, key=lambda item: item[0].st_mtime):
+            if total <= self.max_bytes:
+                break
+            os.remove(file_path)
+            total -= stat.st_size
+
+    def _files(self) -> Iterable[str]:
+        """Gets the paths of the files in the on-disk store."""
+        if self.path is None:
+            return []
+        return [
+            os.path.join(self.path, name)
+            for name in os.listdir(self.path)
+            if name.endswith(".json")
+        ]
+
+
+def _digest(memory: Iterable[int]) -> str:
+    """Gets the hash of a memory's values."""
+    return hashlib.sha256(",".join(str(x) for x in memory).encode()).hexdigest()
@@ -0,0 +1,166 @@
+from __future__ import annotations
+from array import array
+from collections import deque
+import mmap
+import operator
+import os
+import struct
+from typing import TYPE_CHECKING, Generator, Iterable, Optional, Tuple
+
+from aoc.intcode_memory import PagedMemory
+
+if TYPE_CHECKING:
+    from aoc.day_02 import IntcodeComputer
+
+# magic, version, pointer, halted, paged memory, memory size, number of pending
+# inputs and outputs (-1 when not saved), followed by the memory, inputs and
+# outputs as 64-bit integers, all in native byte order
+HEADER = struct.Struct("=8sqqqqqqq")
+MAGIC = b"INTCODE\0"
+VERSION = 2
+
+
+def save_checkpoint(computer: IntcodeComputer, path: str) -> None:
+    """Saves the state of a computer to a file.
+
+    The state is made of the memory, instruction pointer and halted flag, plus
+    the pending inputs and the outputs collected so far. Pending inputs are
+    only saved from a list, tuple, range or deque, and outputs from a list or
+    deque. The computer's state is left untouched. The file is replaced
+    atomically.
+
+    Args:
+        computer (IntcodeComputer): The computer to save.
+        path (str): Path of the checkpoint file.
+    """
+    memory = _pack(computer.memory)
+
+    inputs = computer.inputs
+    pending_inputs = None
+    if isinstance(inputs, deque):
+        pending_inputs = _pack(inputs)
+    elif isinstance(inputs, (list, tuple, range)):
+        # the computer reads through an iterator, which knows how many are left
+        left = operator.length_hint(computer._read.__self__)
+        pending_inputs = _pack(inputs[len(inputs) - left :])
+
+    outputs = computer.outputs
+    saved_outputs = _pack(outputs) if isinstance(outputs, (list, deque)) else None
+
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        computer.pointer,
+        computer.halted,
+        computer.memory_model == "paged",
+        len(memory),
+        -1 if pending_inputs is None else len(pending_inputs),
+        -1 if saved_outputs is None else len(saved_outputs),
+    )
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(header)
+        for values in (memory, pending_inputs, saved_outputs):
+            if values is not None:
+                values.tofile(f)
+    os.replace(temp_path, path)
+
+
+def restore_checkpoint(
+    path: str, computer: Optional[IntcodeComputer] = None
+) -> IntcodeComputer:
+    """Restores the state of a computer from a file.
+
+    The file is memory-mapped and its memory image copied in bulk, with no
+    parsing. The memory is restored in the computer's memory model. Saved
+    inputs replace the computer's inputs, and saved outputs replace the
+    contents of its output list or deque.
+
+    Args:
+        path (str): Path of the checkpoint file.
+        computer (IntcodeComputer, optional): Computer to restore the state into.
+            If None, a new computer is created, whose program is the saved memory
+            and whose memory model is the saved one.
+
+    Returns:
+        IntcodeComputer: The restored computer.
+    """
+    from aoc.day_02 import IntcodeComputer
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        magic, version, pointer, halted, paged, n_memory, n_inputs, n_outputs = (
+            HEADER.unpack_from(m)
+        )
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} Intcode checkpoint.")
+
+        with memoryview(m) as view:
+            offset = HEADER.size
+            memory, offset = _unpack(view, offset, n_memory)
+            inputs, offset = _unpack(view, offset, n_inputs)
+            outputs, offset = _unpack(view, offset, n_outputs)
+
+    if computer is None:
+        computer = IntcodeComputer(memory="paged" if paged else "dense")
+        computer._set_image(memory[:])
+
+    if computer.memory_model == "paged":
+        computer._load_memory(PagedMemory(memory, unbounded=True))
+    else:
+        computer._load_memory(memory)
+    computer.pointer = pointer
+    computer.halted = bool(halted)
+
+    if inputs is not None:
+        computer.inputs = deque(inputs)
+    if outputs is not None:
+        sink = computer.outputs
+        if isinstance(sink, (list, deque)):
+            sink.clear()
+            sink.extend(outputs)
+        else:
+            computer.outputs = list(outputs)
+
+    return computer
+
+
+def run_with_checkpoints(
+    computer: IntcodeComputer, path: str, every: int
+) -> Generator[Optional[int], Optional[int], None]:
+    """Runs a computer like `IntcodeComputer.run`, saving checkpoints on the way.
+
+    A checkpoint is saved after every `every` instructions, and once the
+    program halts.
+
+    Args:
+        computer (IntcodeComputer): The computer to run.
+        path (str): Path of the checkpoint file.
+        every (int): Number of instructions between checkpoints.
+    """
+    while not computer.halted:
+        yield from computer.run(max_steps=every)
+        save_checkpoint(computer, path)
+
+
+def _pack(values: Iterable[int]) -> "array[int]":
+    """Packs values into an array of 64-bit integers."""
+    if isinstance(values, array) and values.typecode == "q":
+        return values
+    try:
+        return array("q", values)
+    except OverflowError:
+        raise ValueError("Checkpoints only support values that fit in 64 bits.")
+
+
+def _unpack(
+    view: memoryview, offset: int, n_values: int
+) -> Tuple[Optional["array[int]"], int]:
+    """Copies `n_values` 64-bit integers from a buffer, unless `n_values` is -1."""
+    if n_values < 0:
+        return None, offset
+
+    end = offset + n_values * 8
+    values = array("q")
+    values.frombytes(view[offset:end])
+    return values, end
@@ -0,0 +1,359 @@
+from __future__ import annotations
+from collections import OrderedDict
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Container,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from aoc.intcode_opcodes import ARITY, HALT, JUMPS, WRITES, opcode_of
+
+if TYPE_CHECKING:
+    from aoc.day_02 import IntcodeComputer
+
+# opcodes that can be compiled, among which jumps end a block
+COMPILABLE = (WRITES | JUMPS) - {3}
+# opcodes that need the computer's I/O or stop it
+IO_OR_HALT = {3, 4, HALT}
+MAX_BLOCK_SIZE = 64
+# compiled blocks kept per program, and programs kept in the cache
+MAX_CACHED_BLOCKS = 1024
+MAX_CACHED_PROGRAMS = 64
+# times a block can be rewritten before its code is left to the interpreter
+MAX_RECOMPILES = 8
+
+
+class Block(NamedTuple):
+    """Straight-line sequence of instructions compiled to a Python function.
+
+    Attributes:
+        start (int): Address of the first instruction.
+        code (Tuple[int, ...]): Memory contents the block was compiled from.
+        size (int): Number of instructions in the block.
+        writes (Tuple[int, ...]): Addresses the block writes to.
+        run (Callable[[List[int]], int]): Runs the block on the given memory
+            and returns the address of the next instruction.
+        source (str): Generated source code.
+    """
+
+    start: int
+    code: Tuple[int, ...]
+    size: int
+    writes: Tuple[int, ...]
+    run: Callable[[List[int]], int]
+    source: str
+
+    @property
+    def cells(self) -> range:
+        """Addresses the block was compiled from."""
+        return range(self.start, self.start + len(self.code))
+
+
+class BlockCache:
+    """Least recently used blocks compiled from a program image.
+
+    Blocks are stored by start address and code, so finding the block for the
+    current memory only takes one lookup per length of the cached blocks
+    starting at that address.
+
+    Args:
+        maxsize (int, optional): Maximum number of blocks. Defaults to
+            `MAX_CACHED_BLOCKS`.
+    """
+
+    def __init__(self, maxsize: int = MAX_CACHED_BLOCKS) -> None:
+        self.maxsize = maxsize
+        self._blocks: OrderedDict[Tuple[int, Tuple[int, ...]], Block] = OrderedDict()
+        # number of cached blocks of each length, by start address
+        self._lengths: Dict[int, Dict[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+    def get(self, memory: List[int], start: int) -> Optional[Block]:
+        """Gets the block compiled from the code found at an address, if cached."""
+        for length in self._lengths.get(start, ()):
+            key = (start, tuple(memory[start : start + length]))
+            block = self._blocks.get(key)
+            if block is not None:
+                self._blocks.move_to_end(key)
+                return block
+        return None
+
+    def add(self, block: Block) -> None:
+        """Adds a block, evicting the least recently used one if full."""
+        key = (block.start, block.code)
+        if key in self._blocks:
+            return
+        self._blocks[key] = block
+        lengths = self._lengths.setdefault(block.start, {})
+        lengths[len(block.code)] = lengths.get(len(block.code), 0) + 1
+
+        if len(self._blocks) > self.maxsize:
+            (start, code), _ = self._blocks.popitem(last=False)
+            lengths = self._lengths[start]
+            lengths[len(code)] -= 1
+            if not lengths[len(code)]:
+                del lengths[len(code)]
+                if not lengths:
+                    del self._lengths[start]
+
+
+# compiled blocks of the most recently used programs, by program hash
+_cache: OrderedDict[str, BlockCache] = OrderedDict()
+
+
+def _program_cache(digest: str) -> BlockCache:
+    """Gets the block cache of a program, evicting the least recently used one."""
+    try:
+        _cache.move_to_end(digest)
+    except KeyError:
+        _cache[digest] = BlockCache()
+        if len(_cache) > MAX_CACHED_PROGRAMS:
+            _cache.popitem(last=False)
+    return _cache[digest]
+
+
+def compile_block(
+    memory: List[int], start: int, avoid: Container[int] = ()
+) -> Optional[Block]:
+    """Compiles the basic block starting at a given address.
+
+    The block ends after a jump, before an instruction that can't be compiled
+    (input, output, halt, invalid or not made of integers), or before an
+    instruction that overlaps an address written by the block or in `avoid`.
+
+    Args:
+        memory (List[int]): The computer's memory.
+        start (int): Address of the block's first instruction.
+        avoid (Container[int], optional): Addresses the block can't be compiled
+            from. Defaults to none.
+
+    Returns:
+        Optional[Block]: The compiled block, or None if the instruction at
+            `start` can't be compiled.
+    """
+
+    def arg(value: int, mode: int) -> str:
+        return str(value) if mode else f"m[{value}]"
+
+    lines: List[str] = []
+    writes: Set[int] = set()
+    pointer = start
+    next_pointer = None
+    size = 0
+
+    while next_pointer is None and size < MAX_BLOCK_SIZE:
+        if not 0 <= pointer < len(memory):
+            break
+        op = memory[pointer]
+        if not isinstance(op, int):
+            break  # e.g. symbolic values
+        opcode = opcode_of(op)
+        n_params = ARITY.get(opcode, 0)
+        cells = range(pointer, pointer + n_params + 1)
+
+        if opcode not in COMPILABLE or pointer + n_params >= len(memory):
+            break
+        if not writes.isdisjoint(cells) or any(cell in avoid for cell in cells):
+            break
+        if not all(isinstance(memory[cell], int) for cell in cells):
+            break
+
+        params = memory[pointer + 1 : pointer + n_params + 1]
+        a, b = (arg(p, op // 10 ** (i + 2) % 10) for i, p in enumerate(params[:2]))
+
+        if opcode in JUMPS:
+            # the target is loaded even if the jump isn't taken, as interpreted
+            lines.append(f"target = {b}")
+            test = a if opcode == 5 else f"not {a}"
+            next_pointer = f"target if {test} else {pointer + n_params + 1}"
+        else:
+            out = params[2]
+            expression = {
+                1: f"{a} + {b}",
+                2: f"{a} * {b}",
+                7: f"1 if {a} < {b} else 0",
+                8: f"1 if {a} == {b} else 0",
+            }[opcode]
+            lines.append(f"m[{out}] = {expression}")
+            # negative addresses are counted from the end, as in a list
+            writes.add(out + len(memory) if out < 0 else out)
+
+        pointer += n_params + 1
+        size += 1
+
+    if pointer == start:
+        return None
+
+    body = lines + [f"return {pointer if next_pointer is None else next_pointer}"]
+    source = f"def block_{start}(m):\n" + "\n".join(f"    {line}" for line in body)
+    namespace: Dict[str, Callable[[List[int]], int]] = {}
+    exec(source, namespace)
+
+    code = tuple(memory[start:pointer])
+    run = namespace[f"block_{start}"]
+    return Block(start, code, size, tuple(sorted(writes)), run, source)
+
+
+class CompiledEngine:
+    """Runs a computer's program through compiled basic blocks.
+
+    Blocks are compiled on first use. Blocks compiled from the unchanged
+    program image are cached per program hash, so they are shared by every
+    computer running the same program, while blocks covering rewritten code
+    only live as long as the engine. Instructions overlapping changed inputs
+    are never compiled, so changing the inputs doesn't need new blocks. A
+    block is only reused if the memory still holds the code it was compiled
+    from. When a write lands on compiled code, the affected blocks are
+    dropped, and code that keeps being rewritten is left to the computer's
+    interpreter, like instructions that can't be compiled. Programs proven
+    static by `IntcodeComputer.analyze` skip tracking writes over code.
+
+    Args:
+        computer (IntcodeComputer): The computer to run. Its memory is converted
+            to a list, if needed.
+    """
+
+    def __init__(self, computer: IntcodeComputer) -> None:
+        self.computer = computer
+        if not isinstance(computer.memory, list):
+            computer.memory = list(computer.memory)
+
+        self._shared = _program_cache(computer._image_digest())
+        self._image = computer._image
+        self._patches = computer._patches
+        # blocks valid for the current memory, by address (None if not compilable)
+        self._blocks: Dict[int, Optional[Block]] = {}
+        # blocks overlapping each address, and blocks that may write over code
+        self._owners: Dict[int, Set[int]] = {}
+        self._writers: Dict[int, Set[int]] = {}
+        self._hazards: Set[int] = set()
+        # number of times the block at each address was dropped
+        self._recompiles: Dict[int, int] = {}
+        analysis = computer._analysis
+        self._static = analysis is not None and analysis.static
+
+    def run(self, pointer: int = 0) -> int:
+        """Runs the program until it halts.
+
+        Args:
+            pointer (int, optional): Address of the first instruction. Defaults to 0.
+
+        Returns:
+            int: Address of the halt instruction.
+        """
+        while True:
+            pointer, _ = self.advance(pointer)
+            next_pointer = self.step(pointer)
+            if next_pointer is None:
+                return pointer
+            pointer = next_pointer
+
+    def advance(self, pointer: int, max_steps: Optional[int] = None) -> Tuple[int, int]:
+        """Runs the program until it needs I/O or halts, or runs out of steps.
+
+        Args:
+            pointer (int): Address of the first instruction.
+            max_steps (int, optional): Maximum number of instructions to run.
+
+        Returns:
+            Tuple[int, int]: Address of the next instruction and number of
+                instructions run.
+        """
+        memory = self.computer.memory
+        blocks = self._blocks
+        hazards = self._hazards
+        steps = 0
+
+        while steps != max_steps:
+            try:
+                block = blocks[pointer]
+            except KeyError:
+                block = self._load(pointer)
+
+            if block is not None and (
+                max_steps is None or steps + block.size <= max_steps
+            ):
+                next_pointer = block.run(memory)
+                if pointer in hazards:
+                    for address in block.writes:
+                        self.invalidate(address)
+                pointer = next_pointer
+                steps += block.size
+                continue
+
+            try:
+                if opcode_of(memory[pointer]) in IO_OR_HALT:
+                    break
+            except IndexError:
+                break  # let the interpreter report it
+            pointer = self.step(pointer)
+            steps += 1
+
+        return pointer, steps
+
+    def step(self, pointer: int) -> Optional[int]:
+        """Runs a single instruction through the interpreter.
+
+        Args:
+            pointer (int): Address of the instruction.
+
+        Returns:
+            Optional[int]: Address of the next instruction, or None if halted.
+        """
+        computer = self.computer
+        instruction = computer._decode(pointer)
+        if instruction.opcode == HALT:
+            return None
+
+        pointer += computer._opcodes[instruction.opcode](pointer, instruction) + 1
+        if instruction.opcode in WRITES and not self._static:
+            self.invalidate(instruction.params[-1])
+
+        return pointer
+
+    def invalidate(self, address: int) -> None:
+        """Drops the blocks compiled from a given address."""
+        for start in self._owners.pop(address, ()):
+            block = self._blocks.pop(start, None)
+            if block is not None:
+                self._recompiles[start] = self._recompiles.get(start, 0) + 1
+                for cell in block.cells:
+                    self._owners.get(cell, set()).discard(start)
+
+    def _load(self, pointer: int) -> Optional[Block]:
+        """Gets the block starting at an address, from the cache or compiling it."""
+        memory = self.computer.memory
+        block = None
+        if self._recompiles.get(pointer, 0) < MAX_RECOMPILES:
+            block = self._shared.get(memory, pointer)
+            if block is None:
+                block = compile_block(memory, pointer, self._patches)
+                if block is not None and self._from_image(block):
+                    self._shared.add(block)
+
+        self._blocks[pointer] = block
+        if block is not None and not self._static:
+            for cell in block.cells:
+                self._owners.setdefault(cell, set()).add(pointer)
+                self._hazards.update(self._writers.get(cell, ()))
+            for address in block.writes:
+                self._writers.setdefault(address, set()).add(pointer)
+                if address in self._owners:
+                    self._hazards.add(pointer)
+
+        return block
+
+    def _from_image(self, block: Block) -> bool:
+        """Checks if a block was compiled from unchanged cells of the program image."""
+        cells = block.cells
+        if cells.stop > len(self._image):
+            return False
+        return tuple(self._image[cells.start : cells.stop]) == block.code
@@ -0,0 +1,199 @@
+from __future__ import annotations
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+import multiprocessing
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from aoc.day_02 import IntcodeComputer
+
+# a job is the name of a program and the inputs to run it with
+Job = Tuple[Hashable, Sequence[int]]
+
+
+class JobResult(NamedTuple):
+    """Result of an Intcode job.
+
+    Attributes:
+        index (int): Position of the job in the submitted batch.
+        outputs (List[int]): Values output by the program, up to any error.
+        error (str, optional): Description of the error that stopped the job,
+            or None if the program halted.
+    """
+
+    index: int
+    outputs: List[int]
+    error: Optional[str] = None
+
+
+class StepLimitError(RuntimeError):
+    """Raised when a job runs more instructions than allowed."""
+
+
+class IntcodeFleet:
+    """Runs batches of independent Intcode jobs on a pool of processes.
+
+    Every program is sent to each worker once, when the pool starts. Jobs are
+    then sent in chunks of small descriptors (program name and inputs), and
+    only outputs come back.
+
+    Args:
+        programs (Dict[Hashable, str]): Intcode programs, by name.
+        workers (int, optional): Number of processes. If 1, jobs run in the
+            current process. Defaults to the number of CPUs.
+        chunk_size (int, optional): Number of jobs sent to a worker at once.
+            Defaults to 64.
+        max_steps (int, optional): Maximum number of instructions per job.
+            Defaults to no limit.
+        engine (str, optional): Engine used by the computers. Defaults to
+            "interpreter".
+    """
+
+    def __init__(
+        self,
+        programs: Dict[Hashable, str],
+        workers: Optional[int] = None,
+        chunk_size: int = 64,
+        max_steps: Optional[int] = None,
+        engine: str = "interpreter",
+    ) -> None:
+        self.programs = programs
+        self.workers = workers if workers else multiprocessing.cpu_count()
+        self.chunk_size = chunk_size
+        self.max_steps = max_steps
+        self.engine = engine
+
+    def map(self, jobs: Iterable[Job], ordered: bool = True) -> Iterator[JobResult]:
+        """Runs a batch of jobs.
+
+        Jobs are read lazily, and only a few chunks per worker are in flight at
+        any time, so batches can be arbitrarily large.
+
+        Args:
+            jobs (Iterable[Job]): Pairs of program name and input values.
+            ordered (bool, optional): If True, results come in the order the jobs
+                were submitted. Otherwise, they come as soon as they are ready.
+                Defaults to True.
+
+        Returns:
+            Iterator[JobResult]: Results of the jobs.
+        """
+        chunks = self._chunks(jobs)
+
+        if self.workers <= 1:
+            _init_worker(self.programs, self.max_steps, self.engine)
+            for chunk in chunks:
+                yield from _run_chunk(chunk)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(),
+            initializer=_init_worker,
+            initargs=(self.programs, self.max_steps, self.engine),
+        ) as executor:
+            pending: Dict[Future[List[JobResult]], int] = {}
+            done_chunks: Dict[int, List[JobResult]] = {}
+            next_chunk = 0
+
+            for n, chunk in enumerate(chunks):
+                pending[executor.submit(_run_chunk, chunk)] = n
+                if len(pending) >= 2 * self.workers:
+                    next_chunk = yield from self._collect(
+                        pending, done_chunks, next_chunk, ordered
+                    )
+
+            while pending:
+                next_chunk = yield from self._collect(
+                    pending, done_chunks, next_chunk, ordered
+                )
+
+    def _chunks(self, jobs: Iterable[Job]) -> Iterator[List[Tuple[int, Job]]]:
+        """Splits jobs into chunks, checking that their programs exist."""
+        indexed = enumerate(jobs)
+        while True:
+            chunk = list(islice(indexed, self.chunk_size))
+            if not chunk:
+                return
+
+            for _, (name, _) in chunk:
+                if name not in self.programs:
+                    raise KeyError(f"Program {name!r} is not part of the fleet.")
+            yield chunk
+
+    @staticmethod
+    def _collect(
+        pending: Dict[Future[List[JobResult]], int],
+        done_chunks: Dict[int, List[JobResult]],
+        next_chunk: int,
+        ordered: bool,
+    ) -> Iterator[JobResult]:
+        """Waits for some chunks to finish and yields the results that are due.
+
+        Returns:
+            int: Position of the next chunk to yield, when results are ordered.
+        """
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            n = pending.pop(future)
+            if not ordered:
+                yield from future.result()
+            else:
+                done_chunks[n] = future.result()
+
+        while next_chunk in done_chunks:
+            yield from done_chunks.pop(next_chunk)
+            next_chunk += 1
+
+        return next_chunk
+
+
+# state of a worker process, set once by `_init_worker`
+_fleet_state: Dict[str, Any] = {}
+
+
+def _init_worker(
+    programs: Dict[Hashable, str], max_steps: Optional[int], engine: str
+) -> None:
+    """Parses every program of the fleet once, in a worker process."""
+    _fleet_state["computers"] = {
+        name: IntcodeComputer(program, engine=engine)
+        for name, program in programs.items()
+    }
+    _fleet_state["max_steps"] = max_steps
+
+
+def _run_chunk(chunk: List[Tuple[int, Job]]) -> List[JobResult]:
+    """Runs a chunk of jobs, capturing the errors of each one."""
+    computers = _fleet_state["computers"]
+    max_steps = _fleet_state["max_steps"]
+
+    results = []
+    for index, (name, inputs) in chunk:
+        outputs: List[int] = []
+        try:
+            computer = computers[name]
+            computer.inputs = inputs
+            for value in computer.reset().run(max_steps):
+                if value is None:
+                    raise EOFError("Program needs more input than was provided.")
+                outputs.append(value)
+
+            if not computer.halted:
+                raise StepLimitError(f"Program didn't halt in {max_steps} steps.")
+        except Exception as err:
+            results.append(JobResult(index, outputs, f"{type(err).__name__}: {err}"))
+        else:
+            results.append(JobResult(index, outputs))
+
+    return results
@@ -0,0 +1,121 @@
+from array import array
+from typing import Dict, Iterable, Iterator, List, MutableSequence, Union
+
+# compact program image: 64-bit integers, or Python ints if any value overflows
+Image = Union["array[int]", List[int]]
+
+
+def parse_image(program: str) -> Image:
+    """Parses a comma-separated intcode program into a compact image.
+
+    Args:
+        program (str): The intcode program.
+
+    Returns:
+        Image: Array of 64-bit integers, or a list if a value does not fit in one.
+    """
+    values = [int(x) for x in program.split(",")] if program.strip() else []
+    return pack_image(values)
+
+
+def pack_image(values: Iterable[int]) -> Image:
+    """Packs integers into an array of 64-bit integers, if they fit in one."""
+    values = list(values)
+    try:
+        return array("q", values)
+    except OverflowError:
+        return values
+
+
+class PagedMemory:
+    """Copy-on-write memory over a program image.
+
+    Memory is split into fixed-size pages. Reads are served by the shared image
+    until a page is first written to, at which point only that page is copied.
+    A page holding a value that doesn't fit in 64 bits is promoted to a list.
+
+    An unbounded memory extends past the end of the image: untouched addresses
+    read as 0, and pages of zeros are only allocated when first written to, so
+    memory use tracks the pages a program actually touches. Its length is one
+    past the highest address written to, or the image's length if greater.
+
+    Args:
+        image (Image): The program image. It is never modified.
+        page_bits (int, optional): Log2 of the page size. Defaults to 9 (512 cells).
+        unbounded (bool, optional): Whether addresses past the end of the image
+            are valid. Negative addresses are then invalid. Defaults to False.
+    """
+
+    def __init__(
+        self, image: Image, page_bits: int = 9, unbounded: bool = False
+    ) -> None:
+        self.unbounded = unbounded
+        self._image = image
+        self._size = len(image)
+        self._bits = page_bits
+        self._mask = (1 << page_bits) - 1
+        self._pages: Dict[int, MutableSequence[int]] = {}
+
+    @property
+    def n_pages(self) -> int:
+        """Number of pages copied from the image."""
+        return len(self._pages)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[int]:
+        return (self[i] for i in range(self._size))
+
+    def __getitem__(self, address: Union[int, slice]) -> Union[int, List[int]]:
+        if isinstance(address, slice):
+            size = self._size
+            if self.unbounded and address.stop is not None:
+                size = max(size, address.stop)
+            return [self[i] for i in range(*address.indices(size))]
+
+        address = self._check(address)
+        page = self._pages.get(address >> self._bits)
+        if page is not None:
+            return page[address & self._mask]
+        if address < len(self._image):
+            return self._image[address]
+        return 0
+
+    def __setitem__(self, address: int, value: int) -> None:
+        address = self._check(address)
+        index = address >> self._bits
+
+        page = self._pages.get(index)
+        if page is None:
+            page = self._pages[index] = self._copy_page(index)
+        if address >= self._size:
+            self._size = address + 1
+
+        try:
+            page[address & self._mask] = value
+        except OverflowError:
+            page = self._pages[index] = list(page)
+            page[address & self._mask] = value
+
+    def _copy_page(self, index: int) -> MutableSequence[int]:
+        """Copies a page from the image, padding it with zeros if unbounded."""
+        size = self._mask + 1
+        start = index << self._bits
+        page = self._image[start : start + size]
+        if self.unbounded and len(page) < size:
+            page.extend(array("q", bytes(8 * (size - len(page)))))
+        return page
+
+    def _check(self, address: int) -> int:
+        """Validates an address, resolving negative ones as lists do if bounded."""
+        if self.unbounded:
+            if address < 0:
+                raise IndexError("negative memory address")
+            return address
+
+        if address < 0:
+            address += self._size
+        if not 0 <= address < self._size:
+            raise IndexError("memory index out of range")
+        return address
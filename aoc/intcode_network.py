@@ -0,0 +1,188 @@
+from __future__ import annotations
+import asyncio
+from collections import deque
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from aoc.day_02 import IntcodeComputer
+
+
+class DeadlockError(RuntimeError):
+    """Raised when every running machine of a network is blocked."""
+
+
+class IntcodeNetwork:
+    """Network of Intcode computers, whose outputs feed each other's inputs.
+
+    Each computer runs as an asyncio task. Its input is a bounded
+    `asyncio.Queue`, to which every machine linked to it sends its outputs.
+    Outputs of machines without outgoing links are collected in `outputs`.
+    Computers yield control to each other whenever they block on I/O, and after
+    running `step_budget` instructions.
+
+    The network takes over the I/O channels of its computers.
+
+    Args:
+        machines (Dict[Hashable, IntcodeComputer]): Computers, by name.
+        links (Iterable[Tuple[Hashable, Hashable]]): (source, target) pairs, where
+            the outputs of source are sent to target.
+        inputs (Dict[Hashable, Iterable[int]], optional): Values read by some
+            machines before any value from their queue.
+        maxsize (int, optional): Capacity of each queue. Defaults to 1024.
+        step_budget (int, optional): Number of instructions a machine runs before
+            yielding control. Defaults to 10000.
+    """
+
+    def __init__(
+        self,
+        machines: Dict[Hashable, IntcodeComputer],
+        links: Iterable[Tuple[Hashable, Hashable]] = (),
+        inputs: Optional[Dict[Hashable, Iterable[int]]] = None,
+        maxsize: int = 1024,
+        step_budget: int = 10000,
+    ) -> None:
+        self.machines = machines
+        self.links: Dict[Hashable, List[Hashable]] = {name: [] for name in machines}
+        for source, target in links:
+            if source not in machines or target not in machines:
+                raise ValueError(f"Link ({source}, {target}) has unknown machines.")
+            self.links[source].append(target)
+
+        self.inputs = inputs if inputs else {}
+        self.maxsize = maxsize
+        self.step_budget = step_budget
+
+        self.outputs: Dict[Hashable, List[int]] = {}
+        self.last_outputs: Dict[Hashable, int] = {}
+
+    @classmethod
+    def chain(
+        cls, machines: Sequence[IntcodeComputer], **kwargs: object
+    ) -> IntcodeNetwork:
+        """Creates a network where each machine feeds the next one.
+
+        Machines are named after their position in `machines`. Other arguments
+        are passed to the constructor.
+        """
+        links = [(i, i + 1) for i in range(len(machines) - 1)]
+        return cls(dict(enumerate(machines)), links, **kwargs)  # type: ignore
+
+    @classmethod
+    def ring(
+        cls, machines: Sequence[IntcodeComputer], **kwargs: object
+    ) -> IntcodeNetwork:
+        """Same as `chain`, but with the last machine feeding the first one."""
+        links = [(i, (i + 1) % len(machines)) for i in range(len(machines))]
+        return cls(dict(enumerate(machines)), links, **kwargs)  # type: ignore
+
+    def execute(self) -> Dict[Hashable, List[int]]:
+        """Runs the network in a new event loop. See `run`."""
+        return asyncio.run(self.run())
+
+    async def run(self) -> Dict[Hashable, List[int]]:
+        """Runs every machine from its initial state, until all of them halt.
+
+        Returns:
+            Dict[Hashable, List[int]]: Outputs of the machines without outgoing
+                links.
+
+        Raises:
+            DeadlockError: If every machine that hasn't halted is blocked.
+        """
+        self._queues: Dict[Hashable, asyncio.Queue[int]] = {
+            name: asyncio.Queue(self.maxsize) for name in self.machines
+        }
+
+        # queue each blocked machine is waiting on, and whether it's putting
+        self._blocked: Dict[Hashable, Tuple[asyncio.Queue[int], bool]] = {}
+        self._running = len(self.machines)
+
+        self.outputs = {name: [] for name, out in self.links.items() if not out}
+        self.last_outputs = {}
+
+        tasks = [asyncio.ensure_future(self._machine(name)) for name in self.machines]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        return self.outputs
+
+    async def _machine(self, name: Hashable) -> None:
+        """Runs a machine, moving values between its run and the queues."""
+        computer = self.machines[name]
+        computer.inputs = deque(self.inputs.get(name, ()))
+        computer.reset()
+
+        inbox = self._queues[name]
+        outboxes = [self._queues[target] for target in self.links[name]]
+        collected = self.outputs.get(name)
+
+        while not computer.halted:
+            run = computer.run(self.step_budget)
+            try:
+                value = next(run)
+                while True:
+                    if value is None:
+                        value = run.send(await self._get(name, inbox))
+                        continue
+
+                    self.last_outputs[name] = value
+                    if collected is not None:
+                        collected.append(value)
+                    for outbox in outboxes:
+                        await self._put(name, outbox, value)
+                    value = next(run)
+            except StopIteration:
+                pass
+
+            # let other machines run after spending the step budget
+            await asyncio.sleep(0)
+
+        self._running -= 1
+        self._check_deadlock()
+
+    async def _get(self, name: Hashable, queue: asyncio.Queue[int]) -> int:
+        """Gets a value from a queue, flagging the machine as blocked if needed."""
+        try:
+            return queue.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+
+        self._blocked[name] = (queue, False)
+        self._check_deadlock()
+        try:
+            return await queue.get()
+        finally:
+            del self._blocked[name]
+
+    async def _put(self, name: Hashable, queue: asyncio.Queue[int], value: int) -> None:
+        """Puts a value in a queue, flagging the machine as blocked if needed."""
+        try:
+            return queue.put_nowait(value)
+        except asyncio.QueueFull:
+            pass
+
+        self._blocked[name] = (queue, True)
+        self._check_deadlock()
+        try:
+            await queue.put(value)
+        finally:
+            del self._blocked[name]
+
+    def _check_deadlock(self) -> None:
+        """Raises a `DeadlockError` if no running machine can make progress.
+
+        A blocked machine could still proceed if its queue got a value (or room
+        for one) that it hasn't taken yet, so queue contents are checked too.
+        """
+        if not self._blocked or len(self._blocked) < self._running:
+            return
+
+        for queue, putting in self._blocked.values():
+            if not (queue.full() if putting else queue.empty()):
+                return
+
+        raise DeadlockError(
+            f"Machines {sorted(map(str, self._blocked))} are blocked on each other."
+        )
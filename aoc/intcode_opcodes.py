@@ -0,0 +1,34 @@
+# number of parameters of each opcode
+ARITY = {1: 3, 2: 3, 3: 1, 4: 1, 5: 2, 6: 2, 7: 3, 8: 3, 99: 0}
+# opcodes that write to the address in their last parameter
+WRITES = {1, 2, 3, 7, 8}
+JUMPS = {5, 6}
+HALT = 99
+# name of each opcode, after its handler in `IntcodeComputer`
+NAMES = {
+    1: "sum",
+    2: "product",
+    3: "input",
+    4: "output",
+    5: "jump_true",
+    6: "jump_false",
+    7: "less_than",
+    8: "equals",
+    99: "halt",
+}
+
+
+def opcode_of(op: int) -> int:
+    """Gets the opcode of an instruction word: its last two decimal digits.
+
+    Negative words are read as text, as the original parser did: those ending
+    in "99" halt, while the others have no valid opcode.
+    """
+    if op >= 0:
+        return op % 100
+    return HALT if str(op).endswith("99") else op
+
+
+def opcode_name(opcode: int) -> str:
+    """Gets the name of an opcode, or the opcode itself if it is invalid."""
+    return NAMES.get(opcode, str(opcode))
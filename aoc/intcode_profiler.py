@@ -0,0 +1,126 @@
+from __future__ import annotations
+from collections import Counter
+import json
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
+
+from aoc.intcode_opcodes import JUMPS, WRITES, opcode_name
+
+if TYPE_CHECKING:
+    from aoc.day_02 import IntcodeComputer
+
+
+class IntcodeProfiler:
+    """Records execution statistics of an Intcode computer's program.
+
+    The program runs through the profiler's own instrumented copy of the
+    interpreter loop, so computers that aren't profiled pay nothing for it.
+    Results are identical to the interpreter's, whatever the computer's engine.
+
+    Args:
+        computer (IntcodeComputer): The computer to profile.
+
+    Attributes:
+        sites (Counter[Tuple[int, int]]): Number of times each opcode ran from
+            each address, by (address, opcode) pair.
+        jumps (Dict[int, List[int]]): Number of times the jump in each address
+            was taken and not taken.
+        writes (Counter[int]): Number of writes to each address.
+        steps (int): Number of instructions run.
+        wall_time (float): Running time, in seconds.
+    """
+
+    def __init__(self, computer: IntcodeComputer) -> None:
+        self.computer = computer
+        self.sites: Counter[Tuple[int, int]] = Counter()
+        self.jumps: Dict[int, List[int]] = {}
+        self.writes: Counter[int] = Counter()
+        self.steps = 0
+        self.wall_time = 0.0
+
+    def execute(self) -> IntcodeProfiler:
+        """Runs the computer's program from its initial state, recording statistics."""
+        computer = self.computer.reset()
+        fetch, handlers, load = computer._fetch, computer._opcodes, computer._load
+        sites, jumps, writes = self.sites, self.jumps, self.writes
+        steps = 0
+        start = time.perf_counter()
+
+        pointer = 0
+        instruction = fetch(pointer)
+        while instruction.opcode != 99:
+            opcode = instruction.opcode
+            sites[pointer, opcode] += 1
+
+            if opcode in WRITES:
+                writes[instruction.params[-1]] += 1
+            elif opcode in JUMPS:
+                taken = bool(load(instruction, 0)) == (opcode == 5)
+                jumps.setdefault(pointer, [0, 0])[not taken] += 1
+
+            pointer += handlers[opcode](pointer, instruction) + 1
+            steps += 1
+            instruction = fetch(pointer)
+
+        self.wall_time += time.perf_counter() - start
+        self.steps += steps
+        computer.pointer = pointer
+        computer.halted = True
+
+        return self
+
+    @property
+    def opcodes(self) -> Counter[int]:
+        """Number of times each opcode ran."""
+        counts: Counter[int] = Counter()
+        for (_, opcode), n in self.sites.items():
+            counts[opcode] += n
+        return counts
+
+    @property
+    def addresses(self) -> Counter[int]:
+        """Number of times an instruction ran from each address."""
+        counts: Counter[int] = Counter()
+        for (address, _), n in self.sites.items():
+            counts[address] += n
+        return counts
+
+    def hot_addresses(self, n: int = 10) -> List[Tuple[int, int]]:
+        """Gets the addresses of the most executed instructions.
+
+        Args:
+            n (int, optional): Number of addresses. Defaults to 10.
+
+        Returns:
+            List[Tuple[int, int]]: Pairs of address and execution count.
+        """
+        return self.addresses.most_common(n)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Exports the statistics as a JSON-serializable dictionary."""
+        return {
+            "steps": self.steps,
+            "wall_time": self.wall_time,
+            "steps_per_second": self.steps / self.wall_time if self.wall_time else None,
+            "opcodes": {opcode_name(op): n for op, n in sorted(self.opcodes.items())},
+            "addresses": {str(a): n for a, n in sorted(self.addresses.items())},
+            "jumps": {
+                str(a): {"taken": taken, "not_taken": not_taken}
+                for a, (taken, not_taken) in sorted(self.jumps.items())
+            },
+            "writes": {str(a): n for a, n in sorted(self.writes.items())},
+        }
+
+    def to_json(self, **kwargs: Any) -> str:
+        """Exports the statistics as JSON. Arguments are passed to `json.dumps`."""
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_collapsed(self) -> str:
+        """Exports instruction counts in collapsed stack format, for flame graphs.
+
+        Each line has the form "intcode;<opcode name>;<address> <count>".
+        """
+        return "\n".join(
+            f"intcode;{opcode_name(op)};{a} {n}"
+            for (a, op), n in sorted(self.sites.items())
+        )
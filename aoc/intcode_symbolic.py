@@ -0,0 +1,205 @@
+from __future__ import annotations
+from itertools import product
+from typing import Any, Dict, Iterator, Sequence, Tuple, Union
+
+# a monomial is the sorted tuple of the indices of its variables, with
+# repetitions standing for powers, e.g. x0 * x1 ** 2 is (0, 1, 1)
+Monomial = Tuple[int, ...]
+
+
+class SymbolicError(Exception):
+    """Raised when a symbolic run needs the concrete value of an unknown."""
+
+
+class Symbolic:
+    """Value that depends on unknowns and can't be used where a concrete one is."""
+
+    def _concrete(self, usage: str) -> Any:
+        raise SymbolicError(f"{usage.capitalize()} depends on unknown values ({self}).")
+
+    def __bool__(self) -> bool:
+        return self._concrete("control flow")
+
+    def __index__(self) -> int:
+        return self._concrete("addressing")
+
+    def __mod__(self, other: Any) -> Any:
+        return self._concrete("instruction decoding")
+
+    def __lt__(self, other: Any) -> bool:
+        return self._concrete("comparison")
+
+    def __gt__(self, other: Any) -> bool:
+        return self._concrete("comparison")
+
+    def __eq__(self, other: Any) -> bool:  # type: ignore
+        return self._concrete("comparison")
+
+    __hash__ = None  # type: ignore
+
+
+class Polynomial(Symbolic):
+    """Polynomial with integer coefficients over the unknowns x0, x1, ...
+
+    Args:
+        terms (Dict[Monomial, int]): Coefficient of each monomial.
+    """
+
+    def __init__(self, terms: Dict[Monomial, int]) -> None:
+        self.terms = {m: c for m, c in terms.items() if c != 0}
+
+    @classmethod
+    def variable(cls, index: int) -> Polynomial:
+        """Creates the polynomial made of the single unknown `x<index>`."""
+        return cls({(index,): 1})
+
+    @classmethod
+    def constant(cls, value: int) -> Polynomial:
+        """Creates a constant polynomial."""
+        return cls({(): value})
+
+    def degree(self, index: int) -> int:
+        """Gets the highest power of unknown `x<index>` in the polynomial."""
+        return max((m.count(index) for m in self.terms), default=0)
+
+    def evaluate(self, values: Sequence[int]) -> int:
+        """Evaluates the polynomial, given the values of all unknowns."""
+        total = 0
+        for monomial, coef in self.terms.items():
+            for index in monomial:
+                coef *= values[index]
+            total += coef
+        return total
+
+    def solve(
+        self, target: int, ranges: Sequence[Sequence[int]]
+    ) -> Iterator[Tuple[int, ...]]:
+        """Finds the values of the unknowns for which the polynomial equals `target`.
+
+        All unknowns but the last are enumerated, which leaves a polynomial on
+        the last unknown. When it is affine, its root is calculated directly.
+
+        Args:
+            target (int): Expected value.
+            ranges (Sequence[Sequence[int]]): Possible values of each unknown.
+
+        Returns:
+            Iterator[Tuple[int, ...]]: Solutions, in the order of `ranges`.
+        """
+        if not ranges:
+            if self.evaluate(()) == target:
+                yield ()
+            return
+
+        *outer, last = range(len(ranges))
+        last_values = set(ranges[last])
+
+        for values in product(*(ranges[i] for i in outer)):
+            # coefficients of the polynomial on the last unknown
+            coefs: Dict[int, int] = {}
+            for monomial, coef in self.terms.items():
+                power = 0
+                for index in monomial:
+                    if index == last:
+                        power += 1
+                    else:
+                        coef *= values[index]
+                coefs[power] = coefs.get(power, 0) + coef
+            coefs[0] = coefs.get(0, 0) - target
+
+            degree = max((p for p, c in coefs.items() if c != 0), default=0)
+            if degree == 0:
+                if coefs[0] == 0:
+                    yield from (values + (x,) for x in ranges[last])
+            elif degree == 1:
+                root, remainder = divmod(-coefs[0], coefs[1])
+                if remainder == 0 and root in last_values:
+                    yield values + (root,)
+            else:
+                for x in ranges[last]:
+                    if sum(c * x**p for p, c in coefs.items()) == 0:
+                        yield values + (x,)
+
+    def __add__(
+        self, other: Union[Polynomial, int]
+    ) -> Union[Polynomial, int, Unresolved]:
+        if isinstance(other, Unresolved):
+            return other
+        if not isinstance(other, Polynomial):
+            other = Polynomial.constant(other)
+
+        terms = dict(self.terms)
+        for monomial, coef in other.terms.items():
+            terms[monomial] = terms.get(monomial, 0) + coef
+        return Polynomial._simplify(terms)
+
+    def __mul__(
+        self, other: Union[Polynomial, int]
+    ) -> Union[Polynomial, int, Unresolved]:
+        if isinstance(other, Unresolved):
+            return other
+        if not isinstance(other, Polynomial):
+            other = Polynomial.constant(other)
+
+        terms: Dict[Monomial, int] = {}
+        for m1, c1 in self.terms.items():
+            for m2, c2 in other.terms.items():
+                monomial = tuple(sorted(m1 + m2))
+                terms[monomial] = terms.get(monomial, 0) + c1 * c2
+        return Polynomial._simplify(terms)
+
+    __radd__ = __add__
+    __rmul__ = __mul__
+
+    @staticmethod
+    def _simplify(terms: Dict[Monomial, int]) -> Union[Polynomial, int]:
+        """Creates a polynomial, or an integer if no unknown is left in it."""
+        polynomial = Polynomial(terms)
+        if set(polynomial.terms) - {()}:
+            return polynomial
+        return polynomial.terms.get((), 0)
+
+    def __repr__(self) -> str:
+        if not self.terms:
+            return "0"
+
+        terms = []
+        for monomial, coef in sorted(self.terms.items()):
+            factors = [f"x{index}" for index in monomial]
+            if coef != 1 or not factors:
+                factors.insert(0, str(coef))
+            terms.append("*".join(factors))
+        return " + ".join(terms)
+
+
+class Unresolved(Symbolic):
+    """Value read from an address that depends on unknowns.
+
+    It is only an error to use such a value: overwriting it is fine.
+
+    Args:
+        address (Polynomial): The address the value was read from.
+    """
+
+    def __init__(self, address: Any) -> None:
+        self.address = address
+
+    def __add__(self, other: Any) -> Unresolved:
+        return self
+
+    __radd__ = __mul__ = __rmul__ = __add__
+
+    def __repr__(self) -> str:
+        return f"memory[{self.address}]"
+
+
+class SymbolicMemory(list):
+    """Memory holding symbolic values, where reads from unknown addresses are allowed.
+
+    Writes to unknown addresses raise a `SymbolicError`.
+    """
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, Symbolic):
+            return Unresolved(index)
+        return super().__getitem__(index)
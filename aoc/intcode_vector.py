@@ -0,0 +1,238 @@
+from __future__ import annotations
+from itertools import product
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from aoc.intcode_memory import parse_image
+from aoc.intcode_opcodes import ARITY, HALT, JUMPS, WRITES, opcode_of
+
+# lane states
+RUNNING, HALTED, FAILED = 0, 1, 2
+INT64_MIN = np.iinfo(np.int64).min
+
+
+class VectorIntcode:
+    """Runs one Intcode program on many memories at once, in lockstep.
+
+    Each lane is a separate machine: a row of a 2D NumPy array of memories,
+    with its own instruction pointer. In every pass, each running lane runs one
+    instruction. Lanes are grouped by instruction pointer and instruction word,
+    and each group runs as a single vectorized operation, so lanes only split
+    when jumps or self-modifications diverge. Parameters may differ between
+    the lanes of a group, including addresses of indirect reads and writes.
+
+    Errors don't stop the batch: the failing lane is stopped, and the error is
+    recorded in `errors`. Values are 64-bit integers: where the interpreter
+    would switch to Python integers, the overflowing lane fails instead.
+
+    Args:
+        program (str): The intcode program.
+        lanes (int): Number of machines.
+        inputs (Sequence[Sequence[int]], optional): Values read by each lane's
+            input instructions. Defaults to no input.
+
+    Attributes:
+        memory (np.ndarray): Memory of every lane, with shape (lanes, size).
+        pointer (np.ndarray): Instruction pointer of every lane.
+        state (np.ndarray): State of every lane (RUNNING, HALTED or FAILED).
+        outputs (List[List[int]]): Values output by every lane.
+        errors (Dict[int, str]): Description of the error that stopped each
+            failed lane.
+        passes (int): Number of passes run.
+    """
+
+    def __init__(
+        self,
+        program: str,
+        lanes: int,
+        inputs: Optional[Sequence[Sequence[int]]] = None,
+    ) -> None:
+        image = np.array(parse_image(program), dtype=np.int64)
+        self.memory = np.tile(image, (lanes, 1))
+        self.pointer = np.zeros(lanes, dtype=np.int64)
+        self.state = np.full(lanes, RUNNING, dtype=np.int8)
+
+        self._inputs = [list(values) for values in inputs] if inputs else None
+        self._read_count = np.zeros(lanes, dtype=np.int64)
+        self.outputs: List[List[int]] = [[] for _ in range(lanes)]
+        self.errors: Dict[int, str] = {}
+        self.passes = 0
+
+    @classmethod
+    def grid(cls, program: str, patches: Dict[int, Iterable[int]]) -> VectorIntcode:
+        """Creates one lane for every combination of values of some addresses.
+
+        Args:
+            program (str): The intcode program.
+            patches (Dict[int, Iterable[int]]): Values to try for each address.
+                Lanes follow the order of `itertools.product` over these values.
+
+        Returns:
+            VectorIntcode: The batch of machines.
+        """
+        combinations = np.array(list(product(*patches.values())), dtype=np.int64)
+        batch = cls(program, len(combinations))
+        for column, address in enumerate(patches):
+            batch.memory[:, address] = combinations[:, column]
+        return batch
+
+    def execute(self, max_passes: Optional[int] = None) -> VectorIntcode:
+        """Runs every lane until it halts or fails.
+
+        Args:
+            max_passes (int, optional): Maximum number of passes, i.e. of
+                instructions run by each lane. Defaults to no limit.
+        """
+        while self.passes != max_passes:
+            running = np.flatnonzero(self.state == RUNNING)
+            if not len(running):
+                break
+
+            for lanes in _groups(running, self.pointer[running]):
+                pointer = int(self.pointer[lanes[0]])
+                if not 0 <= pointer < self.memory.shape[1]:
+                    self._fail(lanes, "IndexError: program has no halt opcode (99).")
+                    continue
+
+                words = self.memory[lanes, pointer]
+                for group in _groups(lanes, words):
+                    self._step(group, pointer, int(self.memory[group[0], pointer]))
+
+            self.passes += 1
+
+        return self
+
+    def _step(self, lanes: np.ndarray, pointer: int, op: int) -> None:
+        """Runs the instruction `op`, located at `pointer`, on a group of lanes."""
+        opcode = opcode_of(op)
+        n_params = ARITY.get(opcode)
+        if n_params is None:
+            self._fail(lanes, f"KeyError: opcode {opcode} not found.")
+            return
+        if pointer + n_params >= self.memory.shape[1]:
+            self._fail(
+                lanes,
+                f"IndexError: operator in address {pointer} is missing parameters.",
+            )
+            return
+
+        if opcode == HALT:
+            self.state[lanes] = HALTED
+            return
+
+        params = self.memory[lanes, pointer + 1 : pointer + n_params + 1]
+        modes = [op // 10 ** (i + 2) % 10 for i in range(n_params)]
+        lanes, params = self._check_addresses(lanes, params, opcode, modes)
+
+        def load(i: int) -> np.ndarray:
+            return params[:, i] if modes[i] else self.memory[lanes, params[:, i]]
+
+        next_pointer = pointer + n_params + 1
+        if opcode in (1, 2, 7, 8):
+            a, b = load(0), load(1)
+            overflow = None
+            if opcode == 1:
+                result = a + b
+                overflow = ((a ^ result) & (b ^ result)) < 0
+            elif opcode == 2:
+                result = a * b
+                overflow = _product_overflow(a, b, result)
+            elif opcode == 7:
+                result = (a < b).astype(np.int64)
+            else:
+                result = (a == b).astype(np.int64)
+
+            if overflow is not None and overflow.any():
+                self._fail(lanes[overflow], "OverflowError: result exceeds 64 bits.")
+                lanes, params, result = (
+                    lanes[~overflow],
+                    params[~overflow],
+                    result[~overflow],
+                )
+            self.memory[lanes, params[:, 2]] = result
+            self.pointer[lanes] = next_pointer
+        elif opcode in JUMPS:
+            condition = load(0) != 0
+            if opcode == 6:
+                condition = ~condition
+            self.pointer[lanes] = np.where(condition, load(1), next_pointer)
+        elif opcode == 3:
+            lanes, params = self._read(lanes, params)
+            self.pointer[lanes] = next_pointer
+        else:
+            for lane, value in zip(lanes.tolist(), load(0).tolist()):
+                self.outputs[lane].append(value)
+            self.pointer[lanes] = next_pointer
+
+    def _check_addresses(
+        self, lanes: np.ndarray, params: np.ndarray, opcode: int, modes: List[int]
+    ) -> tuple:
+        """Fails the lanes whose position-mode parameters are out of memory.
+
+        Negative addresses are resolved from the end, as in the interpreter.
+
+        Returns:
+            tuple: The remaining lanes and their parameters.
+        """
+        size = self.memory.shape[1]
+        # parameters used as addresses: reads in position mode, and writes
+        positional = [i for i, mode in enumerate(modes) if not mode]
+        if opcode in WRITES:
+            positional.append(len(modes) - 1)
+        if not positional:
+            return lanes, params
+
+        addresses = params[:, sorted(set(positional))]
+        valid = ((addresses >= -size) & (addresses < size)).all(axis=1)
+        if not valid.all():
+            self._fail(lanes[~valid], "IndexError: list index out of range")
+            lanes, params = lanes[valid], params[valid]
+        return lanes, params
+
+    def _read(self, lanes: np.ndarray, params: np.ndarray) -> tuple:
+        """Writes the next input value of each lane, failing lanes without one."""
+        counts = self._read_count[lanes]
+        available = np.array(
+            [
+                self._inputs is not None and c < len(self._inputs[lane])
+                for lane, c in zip(lanes.tolist(), counts.tolist())
+            ],
+            dtype=bool,
+        )
+        if not available.all():
+            self._fail(lanes[~available], "EOFError: no input left.")
+            lanes, params, counts = (
+                lanes[available],
+                params[available],
+                counts[available],
+            )
+
+        if len(lanes):
+            values = [
+                self._inputs[lane][c]
+                for lane, c in zip(lanes.tolist(), counts.tolist())
+            ]
+            self.memory[lanes, params[:, 0]] = values
+            self._read_count[lanes] += 1
+        return lanes, params
+
+    def _fail(self, lanes: np.ndarray, error: str) -> None:
+        """Stops a group of lanes, recording their error."""
+        self.state[lanes] = FAILED
+        for lane in lanes.tolist():
+            self.errors[lane] = error
+
+
+def _product_overflow(a: np.ndarray, b: np.ndarray, product: np.ndarray) -> np.ndarray:
+    """Finds the wrapped-around products of 64-bit integers."""
+    with np.errstate(over="ignore"):
+        quotient = product // np.where(a == 0, 1, a)
+    return ((a != 0) & (quotient != b)) | ((a == -1) & (b == INT64_MIN))
+
+
+def _groups(lanes: np.ndarray, keys: np.ndarray) -> List[np.ndarray]:
+    """Splits lanes into groups with equal keys."""
+    order = np.argsort(keys, kind="stable")
+    boundaries = np.flatnonzero(np.diff(keys[order])) + 1
+    return np.split(lanes[order], boundaries)
@@ -0,0 +1,249 @@
+"""Benchmarks of the Intcode computer's engines.
+
+Usage:
+    python -m benchmarks.intcode [--save] [--threshold 0.2] [--scale 1.0]
+
+Every benchmark is run with every engine, reporting instructions per second
+and peak memory use. Results are compared with a JSON baseline, and the run
+fails if an engine got slower than the baseline by more than the threshold.
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from aoc.day_02 import IntcodeComputer
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "intcode_baseline.json")
+# minimum time spent timing each benchmark, per repetition
+MIN_TIME = 0.2
+
+
+class Benchmark(NamedTuple):
+    """Intcode program to benchmark.
+
+    Attributes:
+        name (str): Name of the benchmark.
+        program (str): The intcode program.
+        inputs (Sequence[int]): Values read by the program.
+        changes (Dict[int, int]): Changed inputs, by address.
+    """
+
+    name: str
+    program: str
+    inputs: Sequence[int] = ()
+    changes: Dict[int, int] = {}
+
+
+class Result(NamedTuple):
+    """Measurements of a benchmark run with an engine.
+
+    Attributes:
+        steps (int): Number of instructions run by the program.
+        ips (float): Instructions run per second, in the best repetition.
+        peak_memory (int): Peak memory allocated while running, in bytes.
+    """
+
+    steps: int
+    ips: float
+    peak_memory: int
+
+
+def _loop(body: List[int], n: int) -> str:
+    """Wraps code into a loop that runs it `n` times, then halts.
+
+    The counter and a scratch cell are placed after the code, and referred to
+    in the body as -1 and -2.
+    """
+    size = len(body) + 8
+    counter, scratch = size, size + 1
+    body = [counter if x == -1 else scratch if x == -2 else x for x in body]
+    code = body + [1001, counter, -1, counter, 1005, counter, 0, 99, n, 0]
+    return ",".join(str(x) for x in code)
+
+
+def synthetic_benchmarks(scale: float = 1.0) -> List[Benchmark]:
+    """Creates synthetic programs, each stressing a part of the engines.
+
+    Args:
+        scale (float, optional): Factor of the number of loop iterations.
+            Defaults to 1.
+
+    Returns:
+        List[Benchmark]: The benchmarks.
+    """
+    n = max(1, int(20000 * scale))
+
+    # jumps to the next instruction, 16 times in a row
+    chain = []
+    for i in range(16):
+        chain += [1105, 1, 3 * (i + 1)]
+
+    # the increment of the second sum is itself incremented by the first one
+    self_modifying = [1001, 6, 1, 6, 1001, -2, 0, -2]
+
+    return [
+        Benchmark("arithmetic", _loop([1002, -2, 3, -2, 1001, -2, 1, -2], n)),
+        Benchmark("jump_chain", _loop(chain, n)),
+        Benchmark("io", _loop([3, -2, 4, -2], n), inputs=range(n)),
+        Benchmark("self_modifying", _loop(self_modifying, n)),
+    ]
+
+
+def input_benchmarks(data_path: str = "data") -> List[Benchmark]:
+    """Creates benchmarks running the puzzle inputs.
+
+    Args:
+        data_path (str, optional): Directory of the puzzle inputs.
+            Defaults to "data".
+
+    Returns:
+        List[Benchmark]: The benchmarks.
+    """
+    with open(os.path.join(data_path, "day_02_intcode_program.txt"), "r") as f:
+        day_02 = f.read()
+    with open(os.path.join(data_path, "day_05_intcode_program.txt"), "r") as f:
+        day_05 = f.read()
+
+    return [
+        Benchmark("day_02", day_02, changes={1: 12, 2: 2}),
+        Benchmark("day_05_part_1", day_05, inputs=[1]),
+        Benchmark("day_05_part_2", day_05, inputs=[5]),
+    ]
+
+
+def measure(benchmark: Benchmark, engine: str, repeat: int = 3) -> Result:
+    """Runs a benchmark with an engine.
+
+    Args:
+        benchmark (Benchmark): The benchmark.
+        engine (str): The engine, one of `IntcodeComputer.engines`.
+        repeat (int, optional): Number of timed repetitions. Defaults to 3.
+
+    Returns:
+        Result: The measurements.
+    """
+    computer = IntcodeComputer(
+        benchmark.program, inputs=benchmark.inputs, outputs=[], engine=engine
+    )
+    for address, value in benchmark.changes.items():
+        computer._patch(address, value)
+    steps = computer.profile().steps
+
+    tracemalloc.start()
+    computer.execute()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # run small programs many times, so timings are meaningful
+    runs = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(runs):
+            computer.execute()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_TIME:
+            break
+        runs *= 2
+
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(runs):
+            computer.execute()
+        best = min(best, time.perf_counter() - start)
+
+    return Result(steps, steps * runs / best, peak_memory)
+
+
+def compare(
+    results: Dict[str, Dict[str, Result]],
+    baseline: Dict[str, Dict[str, dict]],
+    threshold: float,
+) -> List[str]:
+    """Finds the benchmarks that got slower than their baseline.
+
+    Args:
+        results (Dict[str, Dict[str, Result]]): Results by benchmark and engine.
+        baseline (Dict[str, Dict[str, dict]]): Baseline results, as saved.
+        threshold (float): Allowed slowdown, as a fraction of the baseline speed.
+
+    Returns:
+        List[str]: Description of each regression.
+    """
+    regressions = []
+    for name, by_engine in results.items():
+        for engine, result in by_engine.items():
+            expected = baseline.get(name, {}).get(engine)
+            if expected is None:
+                continue
+            if result.ips < expected["ips"] * (1 - threshold):
+                regressions.append(
+                    f"{name} ({engine}): {result.ips:,.0f} instructions/s, "
+                    f"baseline {expected['ips']:,.0f}"
+                )
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Runs the benchmarks, returning 1 if any regressed past the threshold."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline file")
+    parser.add_argument("--save", action="store_true", help="save as baseline")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--engine", choices=IntcodeComputer.engines, action="append")
+    args = parser.parse_args(argv)
+
+    engines: Tuple[str, ...] = tuple(args.engine or IntcodeComputer.engines)
+    benchmarks = synthetic_benchmarks(args.scale) + input_benchmarks()
+    results: Dict[str, Dict[str, Result]] = {}
+
+    print(
+        f"{'benchmark':<16}{'engine':<14}{'steps':>10}{'instr/s':>14}{'peak KiB':>10}"
+    )
+    for benchmark in benchmarks:
+        results[benchmark.name] = {}
+        for engine in engines:
+            result = measure(benchmark, engine, args.repeat)
+            results[benchmark.name][engine] = result
+            print(
+                f"{benchmark.name:<16}{engine:<14}{result.steps:>10}"
+                f"{result.ips:>14,.0f}{result.peak_memory / 1024:>10.1f}"
+            )
+
+    if args.save:
+        data = {
+            name: {engine: result._asdict() for engine, result in by_engine.items()}
+            for name, by_engine in results.items()
+        }
+        with open(args.baseline, "w") as f:
+            json.dump(data, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline in {args.baseline}, run with --save to create one.")
+        return 0
+
+    with open(args.baseline, "r") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\nRegressions past {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+
+    print(f"\nNo regressions past {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
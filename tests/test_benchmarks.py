@@ -0,0 +1,41 @@
+from aoc.day_02 import IntcodeComputer
+from benchmarks.intcode import (
+    Result,
+    compare,
+    input_benchmarks,
+    measure,
+    synthetic_benchmarks,
+)
+import pytest
+
+
+@pytest.mark.parametrize("engine", IntcodeComputer.engines)
+def test_synthetic_benchmarks(engine):
+    for benchmark in synthetic_benchmarks(scale=0.001):
+        outputs = []
+        computer = IntcodeComputer(
+            benchmark.program, inputs=benchmark.inputs, outputs=outputs, engine=engine
+        )
+        computer.execute()
+        # the loop counter runs down to 0
+        assert computer.memory[len(computer.memory) - 2] == 0
+        assert outputs == list(benchmark.inputs)
+
+
+def test_measure(monkeypatch):
+    monkeypatch.setattr("benchmarks.intcode.MIN_TIME", 0.0)
+    benchmark = input_benchmarks()[0]
+
+    result = measure(benchmark, "interpreter", repeat=1)
+    assert result.steps == 29
+    assert result.ips > 0
+    assert result.peak_memory > 0
+
+
+def test_compare():
+    results = {"loop": {"interpreter": Result(10, 700.0, 0)}}
+
+    assert compare(results, {"loop": {"interpreter": {"ips": 800.0}}}, 0.2) == []
+    assert compare(results, {}, 0.2) == []
+    (regression,) = compare(results, {"loop": {"interpreter": {"ips": 1000.0}}}, 0.2)
+    assert regression.startswith("loop (interpreter): 700")
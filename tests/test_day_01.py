@@ -1,4 +1,7 @@
+import numpy as np
+
 from aoc.day_01 import RocketLaunch
+import pytest
 
 
 def test_ex_01():
@@ -34,3 +37,47 @@ def test_total():
 
     expected_total = 2 + 2 + 966 + 50346
     assert launch.fuel_requirements() == expected_total
+
+
+def test_deep_fuel():
+    # one fuel step per power of 3, past the recursion limit
+    launch = RocketLaunch()
+    assert launch._get_fuel(3**2000) > 0
+
+
+def test_fuel_array():
+    rng = np.random.default_rng(0)
+    masses = np.concatenate(
+        [
+            rng.integers(-10, 200000, 1000),
+            rng.integers(0, 10**15, 100),
+            [12, 12, 14, 1969, 100756, 2**62],
+        ]
+    )
+    launch = RocketLaunch()
+
+    for ignore_fuel_mass in (True, False):
+        fuel = RocketLaunch.fuel_array(masses, ignore_fuel_mass)
+        fuel_req = launch._get_module_fuel if ignore_fuel_mass else launch._get_fuel
+        assert fuel.tolist() == [fuel_req(int(mass)) for mass in masses]
+
+    launch = RocketLaunch(np.array([12, 14, 1969, 100756]))
+    assert launch.fuel_requirements(ignore_fuel_mass=True) == 2 + 2 + 654 + 33583
+    assert launch.fuel_requirements() == 2 + 2 + 966 + 50346
+
+
+@pytest.mark.parametrize("chunk_size, workers", [(1, 1), (7, 1), (1 << 20, 1), (5, 2)])
+def test_from_file(tmp_path, chunk_size, workers):
+    path = tmp_path / "modules.txt"
+    path.write_text("12\n14\n\n1969\n100756")
+
+    launch = RocketLaunch.from_file(str(path), chunk_size=chunk_size, workers=workers)
+    assert launch.fuel_requirements(ignore_fuel_mass=True) == 2 + 2 + 654 + 33583
+    assert launch.fuel_requirements() == 2 + 2 + 966 + 50346
+
+
+def test_from_empty_file(tmp_path):
+    path = tmp_path / "modules.txt"
+    path.write_text("")
+
+    assert RocketLaunch.from_file(str(path)).fuel_requirements() == 0
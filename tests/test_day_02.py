@@ -53,3 +53,141 @@ def test_no_halt():
     program = "1,0,0,1"
     with pytest.raises(IndexError):
         IntcodeComputer(program).execute()
+
+
+@pytest.mark.parametrize("engine", IntcodeComputer.engines)
+def test_negative_address_over_code(engine):
+    # outputs 5, then rewrites the output's parameter through address -19
+    program = "104,5,1101,9,0,-19,1001,18,1,18,1007,18,2,19,1005,19,0,99,0,0"
+    outputs = []
+    IntcodeComputer(program, outputs=outputs, engine=engine).execute()
+
+    assert outputs == [5, 9]
+
+
+@pytest.mark.parametrize("engine", IntcodeComputer.engines)
+def test_negative_opcodes(engine):
+    # read as text, "-99" ends in a halt opcode and "-1" has no valid opcode
+    for program in ("-99,0,0,0,99", "-199,0,0,0,99"):
+        computer = IntcodeComputer(program, engine=engine).execute()
+        assert list(computer.memory)[0] < 0 and computer.pointer == 0
+
+    # the last program writes -1 over its next instruction
+    for program in ("-1,0,0,0", "-101,0,0,0,99", "1101,-2,1,4,1,0,0,0,99"):
+        with pytest.raises(KeyError):
+            IntcodeComputer(program, engine=engine).execute()
+
+
+def test_self_modifying_parameter():
+    # second pass through the loop runs the first instruction after
+    # its immediate parameter has been overwritten
+    program = "1101,1,0,31,1101,0,10,2,1008,32,0,32,1005,32,0,99" + ",0" * 17
+    computer = IntcodeComputer(program).execute()
+
+    assert computer.memory[2] == 10
+    assert computer.memory[31] == 11
+    assert computer.memory[32] == 0
+
+
+def test_self_modifying_opcode():
+    # the sum at address 0 is rewritten into a product before running again
+    program = "1101,3,5,20,1101,0,1102,0,1008,21,0,21,1005,21,0,99" + ",0" * 6
+    computer = IntcodeComputer(program).execute()
+
+    assert computer.memory[0] == 1102
+    assert computer.memory[20] == 15
+
+
+def test_search_inputs():
+    computer = IntcodeComputer("1,0,0,0,99,10,20,30")
+
+    assert computer.search_inputs(50, range(8), range(8)) == (6, 7)
+    assert computer.search_inputs(1000, range(8), range(8)) is None
+
+
+def test_search_inputs_parallel():
+    computer = IntcodeComputer("1,0,0,0,99,10,20,30")
+
+    assert computer.search_inputs(50, range(8), range(8), workers=2) in {
+        (6, 7),
+        (7, 6),
+    }
+    assert computer.search_inputs(1000, range(8), range(8), workers=2) is None
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_search_inputs_reads_inputs(workers):
+    # memory[0] = noun + verb + input
+    program = "1101,0,0,0,3,12,1,0,12,0,99,0,0"
+
+    computer = IntcodeComputer(program, inputs=[5])
+    assert computer.search_inputs(8, range(5), range(1), workers=workers) == (3, 0)
+
+    computer = IntcodeComputer(program, inputs=lambda: 5)
+    with pytest.raises(EOFError):
+        computer.search_inputs(8, range(5), range(1), workers=workers)
+
+
+def test_search_inputs_silent(capsys):
+    # halts only if noun + verb writes 99 over the next opcode
+    computer = IntcodeComputer("1101,0,0,4,1,0,0")
+
+    assert computer.search_inputs(1101, range(50, 100), range(50)) == (50, 49)
+    assert capsys.readouterr().out == ""
+
+
+def test_change_inputs():
+    computer = IntcodeComputer("1,0,0,0,99,10,20,30").change_inputs(6, 7)
+
+    assert computer.program == "1,6,7,0,99,10,20,30"
+    assert computer.execute().memory[0] == 50
+
+
+def test_fork():
+    computer = IntcodeComputer("1,0,0,0,99,10,20,30")
+    fork = computer.fork().change_inputs(5, 7)
+
+    assert fork.execute().memory[0] == 40
+    assert list(fork.memory) == [40, 5, 7, 0, 99, 10, 20, 30]
+    assert computer.execute().memory[0] == 2
+
+
+def test_overflow():
+    program = f"1002,6,-1,5,99,0,{-(2 ** 63)}"
+    computer = IntcodeComputer(program).execute()
+
+    assert computer.memory[5] == 2**63
+
+
+@pytest.mark.parametrize("engine", IntcodeComputer.engines)
+def test_run_step_budget(engine):
+    # counts to 100, then halts
+    program = "1001,20,1,20,1007,20,100,21,1005,21,0,99" + ",0" * 10
+    computer = IntcodeComputer(program, engine=engine)
+
+    assert list(computer.run(max_steps=10)) == []
+    assert not computer.halted
+    assert computer.memory[20] == 4
+
+    while not computer.halted:
+        list(computer.run(max_steps=7))
+    assert computer.memory[20] == 100
+    assert computer.pointer == 11
+
+    assert list(computer.reset().run(max_steps=1)) == []
+    assert computer.memory[20] == 1
+
+
+def test_paged_memory():
+    # writes the sum of two far-away cells, one never written, past the program
+    program = "1101,20,22,1000000,1,1000000,500000,2000000,99"
+    computer = IntcodeComputer(program, memory="paged").execute()
+
+    assert computer.memory[2000000] == 42
+    assert len(computer.memory) == 2000001
+    assert computer.memory.n_pages == 2
+
+    with pytest.raises(ValueError):
+        IntcodeComputer(program, engine="compiled", memory="paged")
+    with pytest.raises(IndexError):
+        IntcodeComputer(program).execute()
@@ -1,4 +1,7 @@
+import random
+
 from aoc.day_03 import WireIntersections
+import pytest
 
 
 def test_ex01():
@@ -44,3 +47,113 @@ def test_ex03():
     # find shortest
     expected = 410
     assert WireIntersections(wires).find_shortest() == expected
+
+
+@pytest.mark.parametrize("engine", WireIntersections.engines)
+def test_engines(engine):
+    wires = [
+        ["R75", "D30", "R83", "U83", "L12", "D49", "R71", "U7", "L72"],
+        ["U62", "R66", "U55", "R34", "D71", "R55", "D58", "R83"],
+    ]
+    wire_intersections = WireIntersections(wires, engine=engine)
+
+    assert wire_intersections.find_closest() == 159
+    assert wire_intersections.find_shortest() == 610
+
+
+@pytest.mark.parametrize("engine", WireIntersections.engines)
+def test_overlaps(engine):
+    # the wires run together from (3, 0) to (5, 0), and the first one
+    # crosses (4, 0) again on its way back
+    wires = [
+        ["R5", "U2", "L1", "D4"],
+        ["D1", "R3", "U1", "R2", "U4"],
+        ["R7"],
+    ]
+    wire_intersections = WireIntersections(wires, engine=engine)
+
+    assert wire_intersections.find_closest() == 3
+    assert wire_intersections.find_shortest() == 3 + 5 + 3
+
+
+def test_engines_match():
+    rng = random.Random(0)
+    for _ in range(20):
+        wires = [
+            [rng.choice("RLUD") + str(rng.randint(1, 10)) for _ in range(15)]
+            for _ in range(rng.randint(2, 4))
+        ]
+        cells = WireIntersections(wires)
+        try:
+            expected = cells.intersections
+        except ValueError:
+            for engine in ("segments", "numpy"):
+                with pytest.raises(ValueError):
+                    WireIntersections(wires, engine=engine).find_closest()
+            continue
+
+        for engine in ("segments", "numpy"):
+            assert WireIntersections(wires, engine=engine).intersections == expected
+
+
+def test_long_segments():
+    wires = [["R10000000", "U10000000"], ["U5000000", "R20000000"]]
+    wire_intersections = WireIntersections(wires, engine="segments")
+
+    assert wire_intersections.find_closest() == 15000000
+    assert wire_intersections.find_shortest() == 30000000
+
+
+def test_long_overlap():
+    wires = [["R2000000"], ["U1", "D1", "R2000000"]]
+    wire_intersections = WireIntersections(wires, engine="segments")
+
+    assert wire_intersections.find_closest() == 1
+    assert wire_intersections.find_shortest() == 4
+
+
+@pytest.mark.parametrize(
+    "wires",
+    [
+        [["L5", "R12"], ["R9", "L15"]],
+        [["D2", "L3", "U4", "R6"], ["L4", "U2", "R5", "D3"], ["U2", "L5", "R9"]],
+    ],
+)
+def test_overlaps_match_cells(wires):
+    segments = WireIntersections(wires, engine="segments")
+    cells = WireIntersections(wires)
+
+    assert segments.find_closest() == cells.find_closest()
+    assert segments.find_shortest() == cells.find_shortest()
+    assert segments.intersections == cells.intersections
+
+
+def test_first_visit_steps():
+    # the first wire loops back over (0, 2) before crossing the second one
+    wires = [["U3", "R1", "D1", "L2", "D1", "R5"], ["R2", "U4"]]
+    wire_intersections = WireIntersections(wires)
+
+    # cells are stored as complex(y, x)
+    assert wire_intersections.steps[0][complex(2, 0)] == 2
+    assert wire_intersections.steps[0][complex(1, 2)] == 3 + 1 + 1 + 2 + 1 + 3
+    assert wire_intersections.find_shortest() == 11 + 3
+
+    # intersections are found once and shared by the queries
+    intersections = wire_intersections.intersections
+    assert wire_intersections.find_closest() == 3
+    assert wire_intersections.intersections is intersections
+
+
+def test_shared_by_some_wires():
+    wires = [["R8", "U5", "L5", "D3"], ["U7", "R6", "D4", "L4"], ["L2", "U1"]]
+    wire_intersections = WireIntersections(wires, engine="numpy")
+
+    with pytest.raises(ValueError):
+        wire_intersections.find_closest()
+    assert wire_intersections.find_closest(k=2) == 6
+    assert wire_intersections.find_shortest(k=2) == 30
+    # any cell of any wire
+    assert wire_intersections.find_closest(k=1) == 1
+
+    with pytest.raises(ValueError):
+        WireIntersections(wires).find_closest(k=2)
@@ -1,15 +1,68 @@
+import math
+
 from aoc.day_04 import CodeBreaker
+import pytest
 
 
 def test_valid():
     breaker = CodeBreaker(6)
 
-    valid = breaker.valid_passwords()
+    valid = list(breaker.valid_passwords())
     assert "111111" in valid
     assert "223450" not in valid
     assert "123789" not in valid
 
-    valid = breaker.valid_passwords(strict=True)
+    valid = list(breaker.valid_passwords(strict=True))
     assert "112233" in valid
     assert "123444" not in valid
     assert "111122" in valid
+
+
+def test_range():
+    breaker = CodeBreaker(6, valid_range=("278384", "824795"))
+    brute_force = [
+        str(x)
+        for x in range(278384, 824796)
+        if list(str(x)) == sorted(str(x)) and breaker._has_adj(str(x))
+    ]
+
+    valid = breaker.valid_passwords()
+    assert next(valid) == "278888"
+    assert ["278888"] + list(valid) == brute_force
+
+
+def test_long_passwords():
+    # every non-decreasing string of 12 digits from 1 to 9 repeats a digit
+    breaker = CodeBreaker(12)
+    assert sum(1 for _ in breaker.valid_passwords()) == 1 + math.comb(12 + 8, 8)
+
+    breaker = CodeBreaker(15, valid_range=("123456789012345", "123456799999999"))
+    assert list(breaker.valid_passwords()) == ["123456789999999", "123456799999999"]
+    assert list(breaker.valid_passwords(strict=True)) == []
+
+
+@pytest.mark.parametrize("strict", [False, True])
+@pytest.mark.parametrize(
+    "length, valid_range",
+    [
+        (6, None),
+        (6, ("278384", "824795")),
+        (6, ("000000", "223456")),
+        (5, ("11111", "11111")),
+        (2, ("00", "99")),
+        (7, ("5555555", "1234567")),
+    ],
+)
+def test_count_valid(length, valid_range, strict):
+    breaker = CodeBreaker(length, valid_range)
+    expected = sum(1 for _ in breaker.valid_passwords(strict))
+    assert breaker.count_valid(strict) == expected
+
+
+def test_count_long_passwords():
+    breaker = CodeBreaker(50, valid_range=("1" + "0" * 49, "5" * 50))
+
+    # non-decreasing strings starting with 1 to 4, and 55...5
+    expected = sum(math.comb(49 + 9 - d, 9 - d) for d in range(1, 5)) + 1
+    assert breaker.count_valid() == expected
+    assert 0 < breaker.count_valid(strict=True) < breaker.count_valid()
@@ -1,4 +1,7 @@
+from collections import deque
+
 from aoc.day_02 import IntcodeComputer
+import pytest
 
 
 def _run_test(program, expected):
@@ -94,3 +97,64 @@ def test_ex08(monkeypatch, capfd):
     _test_in_out(comp, 7, 999, monkeypatch, capfd)
     _test_in_out(comp, 8, 1000, monkeypatch, capfd)
     _test_in_out(comp, 9, 1001, monkeypatch, capfd)
+
+
+def test_iterable_channels():
+    program = "3,9,8,9,10,9,4,9,99,-1,8"
+    outputs = []
+    comp = IntcodeComputer(program, inputs=[8], outputs=outputs)
+
+    comp.execute()
+    comp.inputs = (x for x in [1])
+    comp.execute()
+    assert outputs == [1, 0]
+
+
+def test_deque_channels():
+    program = "3,0,4,0,3,0,4,0,99"
+    inputs, outputs = deque([7, 11]), deque()
+    IntcodeComputer(program, inputs=inputs, outputs=outputs).execute()
+
+    assert not inputs
+    assert list(outputs) == [7, 11]
+
+
+def test_callable_channels():
+    program = "3,0,1002,0,2,0,4,0,99"
+    outputs = []
+    IntcodeComputer(program, inputs=lambda: 21, outputs=outputs.append).execute()
+
+    assert outputs == [42]
+
+
+def test_missing_input():
+    program = "3,0,3,0,99"
+    with pytest.raises(EOFError):
+        IntcodeComputer(program, inputs=[1]).execute()
+
+
+@pytest.mark.parametrize("engine", IntcodeComputer.engines)
+def test_run_outputs(engine):
+    program = "3,9,8,9,10,9,4,9,99,-1,8"
+    comp = IntcodeComputer(program, inputs=[8], engine=engine)
+
+    assert list(comp.run()) == [1]
+    assert comp.halted
+
+
+@pytest.mark.parametrize("engine", IntcodeComputer.engines)
+def test_run_waits_for_input(engine):
+    # echoes its inputs, doubled, until it reads a zero
+    program = "3,20,1002,20,2,21,4,21,1005,20,0,99" + ",0" * 10
+    inputs = deque([3])
+    comp = IntcodeComputer(program, inputs=inputs, engine=engine)
+
+    run = comp.run()
+    assert next(run) == 6
+    assert next(run) is None
+    assert run.send(5) == 10
+    assert next(run) is None
+
+    inputs.extend([4, 0])
+    assert list(comp.run()) == [8, 0]
+    assert comp.halted
@@ -1,3 +1,6 @@
+import random
+import pytest
+
 from aoc.day_06 import OrbitMap
 
 
@@ -39,3 +42,71 @@ def test_path():
     orbit_map = OrbitMap(orbits)
 
     assert orbit_map.shortest_path("YOU", "SAN") == 4
+
+
+def test_blank_lines():
+    orbit_map = OrbitMap("\nCOM)B\n\nB)C\n")
+
+    assert orbit_map.count_orbits() == 3
+
+
+def test_not_orbiting_com():
+    with pytest.raises(ValueError):
+        OrbitMap("COM)B\nX)Y")
+
+
+def test_long_chain():
+    n = 100_000
+    orbits = "\n".join(f"{i}){i + 1}" for i in range(n)).replace("0)", "COM)", 1)
+    orbit_map = OrbitMap(orbits)
+
+    assert orbit_map.count_orbits() == n * (n + 1) // 2
+
+
+def test_paths():
+    orbits = (
+        "COM)B\n"
+        "B)C\n"
+        "C)D\n"
+        "D)E\n"
+        "E)F\n"
+        "B)G\n"
+        "G)H\n"
+        "D)I\n"
+        "E)J\n"
+        "J)K\n"
+        "K)L\n"
+        "K)YOU\n"
+        "I)SAN"
+    )
+    orbit_map = OrbitMap(orbits)
+
+    assert orbit_map.shortest_paths([("YOU", "SAN"), ("SAN", "YOU"), ("H", "F")]) == [
+        4,
+        4,
+        4,
+    ]
+    with pytest.raises(ValueError):
+        orbit_map.shortest_paths([("YOU", "SAN"), ("YOU", "X")])
+
+
+def test_paths_match_climbing():
+    random.seed(6)
+    names = ["COM"] + [f"O{i}" for i in range(2000)]
+    orbit_map = OrbitMap(
+        "\n".join(f"{names[random.randrange(i)]}){names[i]}" for i in range(1, 2001))
+    )
+    pairs = [tuple(random.sample(names, 2)) for _ in range(200)]
+
+    def climb(begin, end):
+        ancestors = {begin: 0}
+        while begin != "COM":
+            begin = orbit_map.parents[begin]
+            ancestors[begin] = len(ancestors)
+        jumps = 0
+        while end not in ancestors:
+            end = orbit_map.parents[end]
+            jumps += 1
+        return ancestors[end] + jumps - 2
+
+    assert orbit_map.shortest_paths(pairs) == [climb(*pair) for pair in pairs]
@@ -0,0 +1,76 @@
+from aoc.day_02 import IntcodeComputer
+import pytest
+
+# outputs 1 if the input is equal to 8, else 0, using jumps
+EQUAL = "3,15,1008,15,8,16,1006,16,12,104,1,99,104,0,99,-1,-1"
+
+
+def test_disassemble():
+    computer = IntcodeComputer("1105,1,4,0,104,-1,99,1,2")
+    assert computer.disassemble().splitlines() == [
+        "       0   jump_true   1, 4",
+        "       3   data        0",
+        "       4 > output      -1",
+        "       6   halt",
+        "       7   data        1, 2",
+    ]
+
+
+def test_blocks():
+    analysis = IntcodeComputer(EQUAL).analyze()
+
+    assert analysis.jump_targets == {12}
+    assert analysis.blocks == [range(0, 9), range(9, 12), range(12, 15)]
+    assert analysis.written == {15, 16}
+    assert analysis.static
+    assert analysis.never_written(0)
+    assert not analysis.never_written(16)
+
+
+def test_indirect_jump():
+    # jumps to the address stored in 8, which is written by the sum
+    analysis = IntcodeComputer("1101,0,9,8,106,0,8,99,7,99").analyze()
+
+    assert analysis.unresolved == {4}
+    assert not analysis.static
+
+
+def test_self_modifying():
+    # the first instruction turns the second into a halt
+    analysis = IntcodeComputer("1101,0,99,4,1,0,0,0").analyze()
+
+    assert analysis.written == {0, 4}
+    assert not analysis.static
+
+    # instructions may write over code that never runs again
+    assert IntcodeComputer("1,0,0,0,2,4,4,4,99").analyze().static
+
+
+@pytest.mark.parametrize("engine", IntcodeComputer.engines)
+def test_fast_path(engine):
+    outputs = []
+    computer = IntcodeComputer(EQUAL, inputs=[8], outputs=outputs, engine=engine)
+    computer.analyze()
+
+    assert computer._image_decoded.keys() == {0, 2, 6, 9, 11, 12, 14}
+    computer.execute()
+    computer.inputs = [7]
+    computer.execute()
+    assert outputs == [1, 0]
+
+    # changing the inputs drops the fast paths
+    computer.inputs = [8]
+    computer.change_inputs(16, 1008)
+    assert computer._analysis is None
+    computer.execute()
+    assert outputs == [1, 0, 0]
+
+
+def test_day_02():
+    with open("data/day_02_intcode_program.txt") as f:
+        computer = IntcodeComputer(f.read())
+    computer.change_inputs(12, 2)
+    expected = computer.execute().memory[0]
+
+    assert computer.analyze().static
+    assert computer.execute().memory[0] == expected
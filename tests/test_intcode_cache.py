@@ -0,0 +1,102 @@
+import os
+
+from aoc.day_02 import IntcodeComputer
+from aoc.intcode_cache import CachedRun, IntcodeCache
+import pytest
+
+# outputs 1 if the input is equal to 8, else 0
+PROGRAM = "3,9,8,9,10,9,4,9,99,-1,8"
+
+
+def test_hit():
+    cache = IntcodeCache()
+    outputs = []
+    computer = IntcodeComputer(PROGRAM, inputs=[8], outputs=outputs)
+
+    result = cache.execute(computer)
+    assert result.outputs == (1,)
+    assert cache.execute(computer) == result
+    assert outputs == [1, 1]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    computer.inputs = [7]
+    assert cache.execute(computer).outputs == (0,)
+    assert cache.misses == 2
+
+
+def test_patches():
+    cache = IntcodeCache()
+    computer = IntcodeComputer("1,0,0,0,99")
+
+    first = cache.execute(computer)
+    second = cache.execute(computer.change_inputs(2, 2))
+    assert first.memory_digest != second.memory_digest
+    assert cache.misses == 2
+
+
+def test_memory_models():
+    cache = IntcodeCache()
+    program = "1101,1,2,100,4,100,99"
+    paged = IntcodeComputer(program, outputs=[], memory="paged")
+
+    assert cache.execute(paged).outputs == (3,)
+    with pytest.raises(IndexError):
+        cache.execute(IntcodeComputer(program, outputs=[]))
+
+
+def test_uncacheable():
+    cache = IntcodeCache()
+    computer = IntcodeComputer(PROGRAM, inputs=lambda: 8, outputs=[])
+
+    assert cache.execute(computer).outputs == (1,)
+    assert cache.execute(computer).outputs == (1,)
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert cache.key(computer) in cache._uncacheable
+
+    # programs that never read input are cacheable, whatever their source
+    computer = IntcodeComputer("1,0,0,0,4,0,99", outputs=[])
+    cache.execute(computer)
+    assert cache.execute(computer).outputs == (2,)
+    assert cache.hits == 1
+
+
+def test_lru():
+    cache = IntcodeCache(maxsize=2)
+    computer = IntcodeComputer(PROGRAM, outputs=[])
+    for value in (1, 2, 1, 3, 1):
+        computer.inputs = [value]
+        cache.execute(computer)
+
+    assert (cache.hits, cache.misses) == (2, 3)
+
+
+def test_disk_store(tmp_path):
+    path = str(tmp_path / "cache")
+    computer = IntcodeComputer(PROGRAM, inputs=[8], outputs=[])
+    result = IntcodeCache(path=path).execute(computer)
+
+    cache = IntcodeCache(path=path)
+    assert cache.execute(computer) == result
+    assert cache.hits == 1
+
+    cache.clear()
+    assert os.listdir(path) == []
+
+
+def test_disk_eviction(tmp_path):
+    path = str(tmp_path / "cache")
+    cache = IntcodeCache(path=path, max_bytes=250)
+    computer = IntcodeComputer(PROGRAM, outputs=[])
+    for value in range(5):
+        computer.inputs = [value]
+        cache.execute(computer)
+
+    files = os.listdir(path)
+    assert 0 < len(files) < 5
+    assert sum(os.path.getsize(os.path.join(path, name)) for name in files) <= 250
+
+    # the latest result is never evicted
+    computer.inputs = [4]
+    assert IntcodeCache(path=path).execute(computer) == CachedRun(
+        (0,), cache.execute(computer).memory_digest
+    )
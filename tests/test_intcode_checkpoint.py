@@ -0,0 +1,99 @@
+from collections import deque
+from itertools import repeat
+
+from aoc.day_02 import IntcodeComputer
+from aoc.intcode_checkpoint import restore_checkpoint, run_with_checkpoints
+import pytest
+
+# outputs the running sum of its inputs, until it reads a zero
+PROGRAM = "3,20,1,20,21,21,4,21,1005,20,0,99" + ",0" * 10
+
+
+def test_save_and_restore(tmp_path):
+    path = str(tmp_path / "state.ckpt")
+    computer = IntcodeComputer(PROGRAM, inputs=[1, 2, 3, 0])
+    assert list(computer.run(max_steps=8)) == [1, 3]
+    computer.save_checkpoint(path)
+
+    restored = restore_checkpoint(path)
+    assert restored.pointer == computer.pointer == 0
+    assert list(restored.memory) == list(computer.memory)
+    assert list(restored.inputs) == [3, 0]
+
+    assert list(restored.run()) == [6, 6]
+    assert list(computer.run()) == [6, 6]
+
+
+def test_save_keeps_inputs(tmp_path):
+    path = str(tmp_path / "state.ckpt")
+    inputs = [1, 2, 3, 0]
+    computer = IntcodeComputer(PROGRAM, inputs=inputs, outputs=[])
+    assert list(computer.run(max_steps=8)) == [1, 3]
+    computer.save_checkpoint(path)
+    computer.save_checkpoint(path)
+
+    assert computer.inputs is inputs
+    assert list(computer.run()) == [6, 6]
+    assert computer.execute().outputs == [1, 3, 6, 6]
+    assert list(restore_checkpoint(path).inputs) == [3, 0]
+
+
+def test_unknown_inputs(tmp_path):
+    path = str(tmp_path / "state.ckpt")
+    computer = IntcodeComputer(PROGRAM, inputs=repeat(1))
+    assert list(computer.run(max_steps=8)) == [1, 2]
+    computer.save_checkpoint(path)
+
+    restored = IntcodeComputer(PROGRAM, inputs=[7, 0])
+    restored.restore_checkpoint(path)
+    assert restored.inputs == [7, 0]
+    assert list(computer.run(max_steps=7)) == [3, 4]
+
+
+def test_saved_outputs(tmp_path):
+    path = str(tmp_path / "state.ckpt")
+    outputs = deque()
+    computer = IntcodeComputer(PROGRAM, inputs=deque([5, 0]), outputs=outputs)
+    computer.execute().save_checkpoint(path)
+
+    other = IntcodeComputer(PROGRAM, outputs=[9])
+    other.restore_checkpoint(path)
+    assert other.halted
+    assert other.outputs == [5, 5]
+    assert list(other.memory) == list(computer.memory)
+
+
+def test_periodic_checkpoints(tmp_path):
+    path = str(tmp_path / "state.ckpt")
+    computer = IntcodeComputer(PROGRAM, inputs=[1, 2, 3, 4, 0])
+
+    # crash after a couple of outputs
+    run = run_with_checkpoints(computer, path, every=4)
+    assert [next(run), next(run)] == [1, 3]
+    run.close()
+
+    restored = restore_checkpoint(path)
+    assert list(run_with_checkpoints(restored, path, every=4))[-1] == 10
+    assert restore_checkpoint(path).halted
+
+
+def test_invalid_file(tmp_path):
+    path = tmp_path / "state.ckpt"
+    path.write_bytes(b"\0" * 64)
+
+    with pytest.raises(ValueError):
+        restore_checkpoint(str(path))
+
+
+def test_paged_memory(tmp_path):
+    path = str(tmp_path / "state.ckpt")
+    # writes to a far address, then reads an input into another one
+    program = "1101,1,2,5000,3,6000,99"
+    computer = IntcodeComputer(program, inputs=[7], memory="paged")
+    list(computer.run(max_steps=1))
+    computer.save_checkpoint(path)
+
+    for restored in (restore_checkpoint(path), computer.restore_checkpoint(path)):
+        assert restored.memory_model == "paged"
+        assert list(restored.run()) == []
+        assert restored.memory[5000] == 3 and restored.memory[6000] == 7
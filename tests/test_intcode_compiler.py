@@ -0,0 +1,161 @@
+from aoc.day_02 import IntcodeComputer
+from itertools import product
+import random
+
+from aoc import intcode_compiler
+from aoc.intcode_compiler import BlockCache, compile_block
+from aoc.intcode_symbolic import Polynomial
+import pytest
+
+PROGRAMS = [
+    "1,9,10,3,2,3,11,0,99,30,40,50",
+    "1,1,1,4,99,5,6,0,99",
+    "1002,4,3,4,33",
+    # self-modifying parameter and opcode
+    "1101,1,0,31,1101,0,10,2,1008,32,0,32,1005,32,0,99" + ",0" * 17,
+    "1101,3,5,20,1101,0,1102,0,1008,21,0,21,1005,21,0,99" + ",0" * 6,
+    # loop that overwrites its first instruction once done
+    "1001,20,1,20,1007,20,5,21,1005,21,0,1101,0,99,0,99,0,0,0,0,0,0",
+]
+
+IO_PROGRAM = (
+    "3,21,1008,21,8,20,1005,20,22,107,8,21,20,1006,20,31,"
+    "1106,0,36,98,0,0,1002,21,125,20,4,20,1105,1,46,104,"
+    "999,1105,1,46,1101,1000,1,20,4,20,1105,1,46,98,99"
+)
+
+
+def _run(program, engine, inputs=()):
+    outputs = []
+    computer = IntcodeComputer(program, inputs, outputs, engine=engine).execute()
+    return list(computer.memory), outputs
+
+
+@pytest.mark.parametrize("program", PROGRAMS)
+def test_same_results(program):
+    assert _run(program, "compiled") == _run(program, "interpreter")
+
+
+@pytest.mark.parametrize("value", [7, 8, 9])
+def test_same_io(value):
+    expected = _run(IO_PROGRAM, "interpreter", [value])
+    assert _run(IO_PROGRAM, "compiled", [value]) == expected
+
+
+def test_input_over_code():
+    # the input overwrites the immediate parameter of the compiled sum
+    program = "1101,0,0,20,3,2,1008,20,0,21,1005,21,0,99" + ",0" * 8
+    memory, _ = _run(program, "compiled", [7, 7])
+
+    assert memory[20] == 7
+    assert memory == _run(program, "interpreter", [7, 7])[0]
+
+
+def test_compile_block():
+    memory = [1101, 2, 3, 9, 1005, 9, 0, 99, 0, 0]
+    block = compile_block(memory, 0)
+
+    assert block.code == (1101, 2, 3, 9, 1005, 9, 0)
+    assert block.writes == (9,)
+    assert block.run(memory) == 0
+    assert memory[9] == 5
+    assert compile_block(memory, 7) is None
+
+
+def test_compile_block_symbolic():
+    memory = [1101, 2, 3, 9, 1101, Polynomial.variable(0), 3, 9, 99, 0]
+
+    assert compile_block(memory, 0).code == (1101, 2, 3, 9)
+    assert compile_block(memory, 4) is None
+
+
+def test_block_cache():
+    memory = [1101, 2, 3, 9, 1105, 1, 8, 0, 1101, 4, 5, 9, 99]
+    cache = BlockCache(maxsize=2)
+    for start in (0, 8):
+        cache.add(compile_block(memory, start))
+
+    assert cache.get(memory, 0).code == (1101, 2, 3, 9, 1105, 1, 8)
+    assert cache.get(memory, 4) is None
+
+    memory[0] = 1102
+    cache.add(compile_block(memory, 0))
+    assert cache.get(memory, 0).code == (1102, 2, 3, 9, 1105, 1, 8)
+    assert cache.get(memory, 8) is None  # least recently used
+    assert len(cache) == 2
+
+
+def test_changed_inputs_share_blocks():
+    program = "1,9,10,3,2,3,11,0,99,30,40,60"
+    compiled = IntcodeComputer(program, engine="compiled")
+    interpreted = IntcodeComputer(program)
+
+    for noun, verb in product(range(12), repeat=2):
+        compiled.change_inputs(noun, verb).execute()
+        interpreted.change_inputs(noun, verb).execute()
+        assert compiled.memory == list(interpreted.memory)
+
+    # the first instruction reads the changed inputs, so it isn't compiled
+    blocks = intcode_compiler._cache[compiled._image_digest()]
+    assert len(blocks) == 1
+
+
+def test_rewritten_code_not_cached():
+    # the increment of the second sum is itself incremented by the first one
+    program = "1001,6,1,6,1001,17,0,17,1001,16,-1,16,1005,16,0,99,1000,0"
+    compiled = IntcodeComputer(program, engine="compiled").execute()
+    interpreted = IntcodeComputer(program).execute()
+
+    assert compiled.memory == list(interpreted.memory)
+    assert len(intcode_compiler._cache[compiled._image_digest()]) <= 2
+
+
+def _outcome(program, engine, inputs):
+    """Runs a program for a while, returning its state or the error it raised."""
+    outputs = []
+    computer = IntcodeComputer(program, inputs, outputs, engine=engine)
+    try:
+        for value in computer.run(max_steps=200):
+            if value is None:
+                break
+            outputs.append(value)
+    except Exception as err:
+        return type(err), outputs
+    return list(computer.memory), outputs, computer.pointer, computer.halted
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_programs(seed):
+    rng = random.Random(seed)
+    for _ in range(50):
+        size = rng.randint(4, 24)
+        words = []
+        for _ in range(size):
+            if rng.random() < 0.5:
+                modes = rng.choice([0, 100, 1000, 1100])
+                words.append(rng.choice([1, 2, 3, 4, 5, 6, 7, 8, 99]) + modes)
+            else:
+                words.append(rng.randint(-3, size + 2))
+        program = ",".join(str(word) for word in words)
+        inputs = [rng.randint(-3, size + 2) for _ in range(5)]
+
+        expected = _outcome(program, "interpreter", inputs)
+        assert _outcome(program, "compiled", inputs) == expected, program
+
+
+def test_jump_target_loaded():
+    # the jump isn't taken, but its target is read from an address out of memory
+    program = "107,4,16,3,1002,1,6,12,3,2,6,16,2,99,99,99,2,0,-2,2"
+    inputs = [-2, 19, 14, 3, 20]
+
+    assert _outcome(program, "compiled", inputs)[0] is IndexError
+    assert _outcome(program, "interpreter", inputs)[0] is IndexError
+
+
+def test_invalid_program():
+    with pytest.raises(IndexError):
+        IntcodeComputer("1,10,20,30", engine="compiled").execute()
+    with pytest.raises(IndexError):
+        IntcodeComputer("1,0,0,1", engine="compiled").execute()
+    with pytest.raises(ValueError):
+        IntcodeComputer("99", engine="jit")
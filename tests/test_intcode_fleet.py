@@ -0,0 +1,46 @@
+from aoc.intcode_fleet import IntcodeFleet, JobResult
+import pytest
+
+PROGRAMS = {
+    # outputs 1 if the input is equal to 8, else 0
+    "equal": "3,9,8,9,10,9,4,9,99,-1,8",
+    # outputs the input doubled
+    "double": "3,0,1002,0,2,0,4,0,99",
+    # never halts
+    "loop": "1105,1,0",
+}
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_ordered(workers):
+    fleet = IntcodeFleet(PROGRAMS, workers=workers, chunk_size=3)
+    jobs = [("double", [x]) for x in range(20)] + [("equal", [8])]
+
+    results = list(fleet.map(jobs))
+    assert results[:20] == [JobResult(x, [2 * x]) for x in range(20)]
+    assert results[20] == JobResult(20, [1])
+
+
+def test_unordered():
+    fleet = IntcodeFleet(PROGRAMS, workers=2, chunk_size=2)
+    jobs = (("equal", [x]) for x in range(10))
+
+    results = sorted(fleet.map(jobs, ordered=False))
+    assert results == [JobResult(x, [int(x == 8)]) for x in range(10)]
+
+
+def test_errors():
+    fleet = IntcodeFleet(PROGRAMS, workers=1, max_steps=100)
+    jobs = [("loop", []), ("double", []), ("double", [4])]
+
+    loop, missing, ok = fleet.map(jobs)
+    assert loop.error.startswith("StepLimitError")
+    assert missing.error.startswith("EOFError")
+    assert ok == JobResult(2, [8])
+
+
+def test_unknown_program():
+    fleet = IntcodeFleet(PROGRAMS, workers=1)
+
+    with pytest.raises(KeyError):
+        list(fleet.map([("square", [1])]))
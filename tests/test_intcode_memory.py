@@ -0,0 +1,58 @@
+from array import array
+
+from aoc.intcode_memory import PagedMemory, parse_image
+import pytest
+
+
+def test_parse_image():
+    assert parse_image("1,-2,3") == array("q", [1, -2, 3])
+    assert parse_image("") == array("q")
+    assert parse_image(f"1,{2 ** 70}") == [1, 2**70]
+
+
+def test_copy_on_write():
+    image = array("q", range(20))
+    memory = PagedMemory(image, page_bits=2)
+
+    memory[5] = 100
+    memory[-1] = 200
+    assert list(memory) == list(range(5)) + [100] + list(range(6, 19)) + [200]
+    assert memory[4:7] == [4, 100, 6]
+    assert memory.n_pages == 2
+    assert image == array("q", range(20))
+
+
+def test_overflow():
+    memory = PagedMemory(array("q", range(8)), page_bits=2)
+
+    memory[1] = 2**70
+    assert memory[1] == 2**70
+    assert memory[6] == 6
+
+
+def test_out_of_range():
+    memory = PagedMemory(array("q", range(8)))
+
+    with pytest.raises(IndexError):
+        memory[8]
+    with pytest.raises(IndexError):
+        memory[-9] = 1
+
+
+def test_unbounded():
+    memory = PagedMemory(array("q", range(6)), page_bits=2, unbounded=True)
+
+    assert memory[5] == 5
+    assert memory[10**9] == 0
+    assert len(memory) == 6
+    assert memory.n_pages == 0
+
+    memory[5] = -5
+    memory[10**9] = 2**70
+    assert memory[4:8] == [4, -5, 0, 0]
+    assert memory[10**9 - 1 : 10**9 + 1] == [0, 2**70]
+    assert len(memory) == 10**9 + 1
+    assert memory.n_pages == 2
+
+    with pytest.raises(IndexError):
+        memory[-1]
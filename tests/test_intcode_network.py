@@ -0,0 +1,50 @@
+from aoc.day_02 import IntcodeComputer
+from aoc.intcode_network import DeadlockError, IntcodeNetwork
+import pytest
+
+# reads a value, outputs it plus one and halts
+INCREMENT = "3,20,1001,20,1,20,4,20,99" + ",0" * 12
+
+# amplifier controller software, with feedback loop
+AMPLIFIER = (
+    "3,26,1001,26,-4,26,3,27,1002,27,2,27,1,27,26,"
+    "27,4,27,1001,28,-1,28,1005,28,6,99,0,0,5"
+)
+
+
+def test_chain():
+    machines = [IntcodeComputer(INCREMENT) for _ in range(200)]
+    network = IntcodeNetwork.chain(machines, inputs={0: [0]})
+
+    assert network.execute() == {199: [200]}
+
+
+def test_feedback_loop():
+    machines = [IntcodeComputer(AMPLIFIER) for _ in range(5)]
+    phases = [9, 8, 7, 6, 5]
+    inputs = {i: [phase] for i, phase in enumerate(phases)}
+    inputs[0].append(0)
+    network = IntcodeNetwork.ring(machines, inputs=inputs, maxsize=1, step_budget=5)
+
+    assert network.execute() == {}
+    assert network.last_outputs[4] == 139629729
+
+
+def test_graph():
+    machines = {name: IntcodeComputer(INCREMENT) for name in "abcd"}
+    links = [("a", "b"), ("a", "c"), ("b", "d")]
+    network = IntcodeNetwork(machines, links, inputs={"a": [10], "c": [0]})
+
+    assert network.execute() == {"c": [1], "d": [13]}
+
+
+def test_deadlock():
+    machines = [IntcodeComputer(INCREMENT) for _ in range(3)]
+
+    with pytest.raises(DeadlockError):
+        IntcodeNetwork.ring(machines).execute()
+
+
+def test_unknown_link():
+    with pytest.raises(ValueError):
+        IntcodeNetwork({"a": IntcodeComputer(INCREMENT)}, [("a", "b")])
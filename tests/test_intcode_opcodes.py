@@ -0,0 +1,16 @@
+from aoc.day_02 import IntcodeComputer
+from aoc.intcode_opcodes import ARITY, HALT, NAMES, opcode_name, opcode_of
+
+
+def test_names_match_handlers():
+    handlers = IntcodeComputer()._opcodes
+
+    assert set(NAMES) == set(ARITY) == set(handlers) | {HALT}
+    for opcode, handler in handlers.items():
+        assert opcode_name(opcode) == handler.__name__[len("_op_") :]
+    assert opcode_name(42) == "42"
+
+
+def test_opcode_of():
+    assert [opcode_of(op) for op in (1, 1002, 99, 11199)] == [1, 2, 99, 99]
+    assert [opcode_of(op) for op in (-99, -199, -1, -101)] == [99, 99, -1, -101]
@@ -0,0 +1,40 @@
+import json
+
+from aoc.day_02 import IntcodeComputer
+
+# counts to 5, then halts
+PROGRAM = "1001,20,1,20,1007,20,5,21,1005,21,0,99" + ",0" * 10
+
+
+def test_counts():
+    profile = IntcodeComputer(PROGRAM).profile()
+
+    assert profile.steps == 15
+    assert profile.opcodes == {1: 5, 7: 5, 5: 5}
+    assert profile.hot_addresses(1) == [(0, 5)]
+    assert profile.jumps == {8: [4, 1]}
+    assert profile.writes == {20: 5, 21: 5}
+    assert profile.computer.memory[20] == 5
+    assert profile.computer.halted
+
+
+def test_same_results():
+    computer = IntcodeComputer(PROGRAM, engine="compiled")
+    expected = list(computer.execute().memory)
+
+    assert list(computer.profile().computer.memory) == expected
+
+
+def test_exports():
+    profile = IntcodeComputer(PROGRAM).profile()
+
+    data = json.loads(profile.to_json())
+    assert data["steps"] == 15
+    assert data["opcodes"] == {"sum": 5, "jump_true": 5, "less_than": 5}
+    assert data["jumps"] == {"8": {"taken": 4, "not_taken": 1}}
+
+    assert profile.to_collapsed().split("\n") == [
+        "intcode;sum;0 5",
+        "intcode;less_than;4 5",
+        "intcode;jump_true;8 5",
+    ]
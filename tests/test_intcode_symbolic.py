@@ -0,0 +1,108 @@
+from aoc.day_02 import IntcodeComputer
+from aoc.intcode_symbolic import Polynomial, SymbolicError
+import pytest
+
+
+def test_polynomial():
+    x0, x1 = Polynomial.variable(0), Polynomial.variable(1)
+    poly = (x0 + 2) * x1 * x1 + 3
+
+    assert poly.terms == {(0, 1, 1): 1, (1, 1): 2, (): 3}
+    assert poly.degree(1) == 2
+    assert poly.evaluate([1, 2]) == 15
+
+
+def test_solve():
+    x0, x1 = Polynomial.variable(0), Polynomial.variable(1)
+
+    affine = x0 * 100 + x1 * 3 + 7
+    assert list(affine.solve(1210, [range(20), range(20)])) == [(12, 1)]
+
+    quadratic = x0 * x1 * x1
+    assert list(quadratic.solve(18, [range(10), range(10)])) == [(2, 3)]
+
+
+def test_evaluate_symbolic():
+    # memory[0] = (x0 + 5) * x1, with the unknowns used as immediate parameters
+    program = "1101,5,0,0,1002,0,0,0,99"
+    result = IntcodeComputer(program).evaluate_symbolic((2, 6))
+
+    assert result.terms == {(0, 1): 1, (1,): 5}
+
+
+def test_overwritten_unresolved_read():
+    # the first sum reads from unknown addresses, but is overwritten
+    program = "1,0,0,0,1,1,2,0,99"
+    result = IntcodeComputer(program).evaluate_symbolic()
+
+    assert result.terms == {(0,): 1, (1,): 1}
+
+
+def test_symbolic_control_flow():
+    program = "1105,0,4,99,99"
+    with pytest.raises(SymbolicError):
+        IntcodeComputer(program).evaluate_symbolic((1,))
+
+
+def test_solve_inputs():
+    program = "1101,0,0,0,1002,0,0,0,99"
+    computer = IntcodeComputer(program)
+
+    assert computer.solve_inputs(24, {2: range(10), 6: range(10)}) == (3, 8)
+    assert computer.solve_inputs(-1, {2: range(10), 6: range(10)}) is None
+
+
+def test_solve_inputs_fallback():
+    # jump depends on the unknown in address 1
+    program = "1005,0,4,99,1101,7,0,0,99"
+    computer = IntcodeComputer(program)
+
+    with pytest.warns(RuntimeWarning):
+        assert computer.solve_inputs(10, {6: range(5), 1: range(5)}) == (3, 0)
+
+
+def test_evaluate_symbolic_resets():
+    program = "1101,5,0,0,1002,0,0,0,99"
+    computer = IntcodeComputer(program)
+    computer.evaluate_symbolic((2, 6))
+
+    assert computer.memory[0] == 1101
+    assert computer.execute().memory[0] == 0
+
+    computer = IntcodeComputer("1105,0,4,99,99")
+    with pytest.raises(SymbolicError):
+        computer.evaluate_symbolic((1,))
+    assert computer.memory[1] == 0 and not computer.halted
+
+
+def test_solve_no_unknowns():
+    constant = Polynomial.constant(5)
+
+    assert list(constant.solve(5, [])) == [()]
+    assert list(constant.solve(4, [])) == []
+
+
+@pytest.mark.parametrize("engine", IntcodeComputer.engines)
+def test_engines(engine):
+    program = "1101,5,0,0,1002,0,0,0,1,0,0,0,99"
+    computer = IntcodeComputer(program, engine=engine)
+
+    assert computer.evaluate_symbolic((2, 6)).terms == {(0, 1): 2, (1,): 10}
+    assert computer.solve_inputs(72, {2: range(10), 6: range(10)}) == (1, 6)
+    assert computer.execute().memory[0] == 0
+
+
+def test_constant_results():
+    x0, x1 = Polynomial.variable(0), Polynomial.variable(1)
+
+    assert x0 * 0 == 0 and isinstance(x0 * 0, int)
+    assert (x0 + 3) + (x0 * -1) == 3
+    assert isinstance(x0 * x1 + 1, Polynomial)
+
+
+def test_constant_control_flow():
+    # jumps on x0 * 0, which doesn't depend on the unknown
+    program = "1002,12,0,12,1005,12,11,1101,0,5,0,99,0"
+    result = IntcodeComputer(program).evaluate_symbolic((12,))
+
+    assert result.terms == {(): 5}
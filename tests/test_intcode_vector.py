@@ -0,0 +1,80 @@
+import numpy as np
+
+from aoc.day_02 import IntcodeComputer
+from aoc.intcode_vector import FAILED, HALTED, RUNNING, VectorIntcode
+
+
+def test_grid():
+    with open("data/day_02_intcode_program.txt") as f:
+        program = f.read()
+
+    batch = VectorIntcode.grid(program, {1: range(100), 2: range(100)}).execute()
+    assert (batch.state == HALTED).all()
+    assert batch.passes < 100
+
+    (lane,) = np.flatnonzero(batch.memory[:, 0] == 19690720)
+    assert lane == 4559
+
+    computer = IntcodeComputer(program)
+    computer.change_inputs(12, 2)
+    assert batch.memory[1202, 0] == computer.execute().memory[0]
+
+
+def test_divergent_lanes():
+    # outputs 1 if the input is non-zero, else 0, using a jump
+    program = "3,3,1105,-1,9,1101,0,0,12,4,12,99,1"
+    inputs = [[0], [8], [1], []]
+    batch = VectorIntcode(program, len(inputs), inputs).execute()
+
+    assert batch.outputs == [[0], [1], [1], []]
+    assert list(batch.state) == [HALTED, HALTED, HALTED, FAILED]
+    assert batch.errors == {3: "EOFError: no input left."}
+
+
+def test_indirect_addresses():
+    # lanes add the values at different addresses, and one reads out of memory
+    batch = VectorIntcode.grid("1,0,0,0,99", {2: [0, 4, 100]}).execute()
+
+    assert list(batch.memory[:, 0]) == [2, 100, 1]
+    assert list(batch.state) == [HALTED, HALTED, FAILED]
+    assert batch.errors[2].startswith("IndexError")
+
+
+def test_max_passes():
+    batch = VectorIntcode("1105,1,0", 3).execute(max_passes=10)
+    assert batch.passes == 10
+    assert (batch.state == RUNNING).all()
+
+
+def test_overflow():
+    # memory[0] = x * y, then memory[0] += x
+    big = 2**62
+    cases = [
+        (big, 1),
+        (big, 2),
+        (-big, 2),
+        (-1, -(2**63)),
+        (2**63 - 1, 1),
+        (-big, 1),
+        (-3, 5),
+    ]
+    inputs = [list(case) for case in cases]
+    program = "3,20,3,21,2,20,21,0,1,0,20,0,99" + ",0" * 10
+    batch = VectorIntcode(program, len(inputs), inputs).execute()
+
+    for lane, (x, y) in enumerate(cases):
+        computer = IntcodeComputer(program, inputs=[x, y]).execute()
+        if -(2**63) <= x * y + x < 2**63 and -(2**63) <= x * y < 2**63:
+            assert batch.state[lane] == HALTED
+            assert batch.memory[lane, 0] == computer.memory[0]
+        else:
+            assert batch.state[lane] == FAILED
+            assert batch.errors[lane].startswith("OverflowError")
+
+
+def test_negative_opcodes():
+    batch = VectorIntcode.grid("-99,0,0,0,99", {0: [-99, -1, -101]}).execute()
+
+    assert list(batch.state) == [HALTED, FAILED, FAILED]
+    assert batch.memory[0, 0] == -99
+    assert batch.errors[1].startswith("KeyError")